@@ -0,0 +1,226 @@
+"""
+Benchmark for the Dependency Graph Builder
+
+Builds a synthetic OpenAPI specification of a chosen size and times the
+stages whose implementations replaced networkx or pairwise scans:
+
+1. PARAMETER ANALYSIS
+   - Exact phase (producer/consumer hash join on parameter name)
+   - Fuzzy phase (indexed name matching)
+
+2. CYCLE CHECKS (Step 4)
+   - Pearce-Kelly incremental order vs nx.has_path per inserted edge
+
+3. TRANSITIVE REDUCTION
+   - Bitset reduction vs nx.transitive_reduction (results are compared)
+
+4. REACHABILITY
+   - Frozen reachability index vs nx.has_path for random operation pairs
+
+Usage:
+    python benchmark.py --operations 1200
+    python benchmark.py --operations 10000 --skip-networkx
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict
+
+import networkx as nx
+
+from dependency_graph.builder import DependencyGraphBuilder
+from dependency_graph.core import DependencyGraph
+from dependency_graph.parameter_analyzer import ParameterDependencyAnalyzer
+from dependency_graph.reachability import ReachabilityIndex
+from dependency_graph.reduction import redundant_edges
+
+RESOURCES = ['repos', 'orgs', 'users', 'issues', 'pulls', 'gists', 'teams', 'projects',
+             'actions', 'checks', 'packages', 'apps', 'reactions', 'commits', 'branches',
+             'hooks', 'keys', 'labels', 'milestones', 'releases']
+
+
+def synthetic_spec(operations: int, seed: int) -> Dict[str, Any]:
+    """A GitHub-like spec: nested resource paths, id parameters, enums, ranges and patterns"""
+    rng = random.Random(seed)
+    schemas = {
+        resource.capitalize(): {
+            'type': 'object',
+            'properties': {
+                'id': {'type': 'integer'},
+                f'{resource[:-1]}_id': {'type': 'integer'},
+                'name': {'type': 'string'},
+                'url': {'type': 'string'},
+                'owner': {'$ref': '#/components/schemas/Users'},
+                'state': {'type': 'string', 'enum': ['open', 'closed']},
+            }
+        }
+        for resource in RESOURCES
+    }
+    paths: Dict[str, Any] = {}
+    count = 0
+    index = 0
+    while count < operations:
+        segments = []
+        for _ in range(rng.randint(1, 4)):
+            resource = rng.choice(RESOURCES)
+            segments.append(resource)
+            if rng.random() < 0.7:
+                segments.append('{' + resource[:-1] + '_' + rng.choice(['id', 'name', 'number']) + '}')
+        if rng.random() < 0.3:
+            segments.append(f'x{index}')
+        index += 1
+        path = '/' + '/'.join(segments)
+        if path in paths:
+            continue
+        resource = segments[-1] if not segments[-1].startswith('{') else segments[-2]
+        item = {}
+        for method in rng.sample(['get', 'post', 'put', 'patch', 'delete'], rng.randint(1, 4)):
+            parameters = [{'name': segment.strip('{}'), 'in': 'path', 'required': True,
+                           'schema': {'type': 'string', 'pattern': '^[a-z0-9-]+$'}}
+                          for segment in segments if segment.startswith('{')]
+            parameters.append({
+                'name': rng.choice(['per_page', 'page', 'sort', 'direction', 'state']),
+                'in': 'query',
+                'schema': ({'type': 'string', 'enum': ['a', 'b']} if rng.random() < 0.4 else
+                           {'type': 'integer', 'minimum': 1, 'maximum': 100})
+            })
+            schema_ref = f'#/components/schemas/{rng.choice(RESOURCES).capitalize()}'
+            operation = {
+                'operationId': f'{method}-{index}-{resource}',
+                'parameters': parameters,
+                'tags': [rng.choice(RESOURCES + ['auth', 'admin'])],
+                'responses': {'200': {'description': 'ok', 'content': {
+                    'application/json': {'schema': {'$ref': schema_ref}}}}}
+            }
+            if rng.random() < 0.5:
+                operation['security'] = [{'oauth': []}]
+            if method in ('post', 'put', 'patch'):
+                body = resource.capitalize() if resource.capitalize() in schemas else 'Repos'
+                operation['requestBody'] = {'content': {'application/json': {
+                    'schema': {'$ref': f'#/components/schemas/{body}'}}}}
+            item[method] = operation
+            count += 1
+        paths[path] = item
+    paths['/login'] = {'post': {'operationId': 'login', 'responses': {'200': {'description': 'ok'}}}}
+    return {'openapi': '3.0.0', 'info': {'title': 'synthetic', 'version': '1'},
+            'paths': paths, 'components': {'schemas': schemas}}
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def report(label: str, seconds: float, baseline: float = None):
+    line = f"  {label:<42} {seconds:9.3f}s"
+    if baseline is not None:
+        line += f"   networkx {baseline:9.3f}s  (x{baseline / max(seconds, 1e-9):.1f})"
+    print(line)
+
+
+def run(operations: int, seed: int, queries: int, skip_networkx: bool):
+    with tempfile.TemporaryDirectory() as directory:
+        spec_path = os.path.join(directory, 'synthetic.json')
+        with open(spec_path, 'w', encoding='utf-8') as f:
+            json.dump(synthetic_spec(operations, seed), f)
+
+        builder = DependencyGraphBuilder(spec_path)
+        # Keep the pre-reduction graph so the reduction itself can be timed below
+        builder.graph.transitive_reduction = lambda prune_dependencies=True: 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            graph = builder.build()
+
+    ops = builder.operations
+    print(f"Synthetic spec: {len(ops)} operations, {len(graph.dependencies)} dependencies "
+          f"before reduction")
+    print()
+
+    # 1. Parameter analysis
+    print("PARAMETER ANALYSIS")
+    producers, consumers = {}, {}
+    for op in ops:
+        resource = op.resource_type or '__global__'
+        for param in op.produces:
+            producers.setdefault((param, resource), []).append(op)
+        for param in op.consumes:
+            consumers.setdefault((param, resource), []).append(op)
+    exact_only = ParameterDependencyAnalyzer(ops)
+    exact_only._fuzzy_parameter_matching = lambda producers, consumers: []
+    _, exact = timed(lambda: list(exact_only.iter_dependencies()))
+    fuzzy_phase = ParameterDependencyAnalyzer(ops)._fuzzy_parameter_matching
+    _, fuzzy = timed(lambda: list(fuzzy_phase(producers, consumers)))
+    report("exact phase", exact)
+    report("fuzzy phase", fuzzy)
+    print()
+
+    # 2. Cycle checks over the accepted dependencies, in build order
+    print("CYCLE CHECKS (Step 4)")
+    timings = {}
+    for incremental in (True, False):
+        if not incremental and skip_networkx:
+            continue
+        replay = DependencyGraph(incremental_cycle_check=incremental)
+        for op in ops:
+            replay.add_operation(op)
+        _, timings[incremental] = timed(
+            lambda: [replay.add_dependency_if_acyclic(dep) for dep in graph.dependencies])
+    report("incremental topological order", timings[True], timings.get(False))
+    print()
+
+    # 3. Transitive reduction
+    print("TRANSITIVE REDUCTION")
+    redundant, bitset = timed(redundant_edges, graph.graph)
+    baseline = None
+    if not skip_networkx:
+        reduced, baseline = timed(nx.transitive_reduction, graph.graph)
+        kept = set(graph.graph.edges) - set(redundant)
+        assert kept == set(reduced.edges), "bitset reduction differs from networkx"
+    report(f"bitset reduction ({len(redundant)} edges removed)", bitset, baseline)
+    print()
+
+    # 4. Reachability
+    print("REACHABILITY")
+    del graph.transitive_reduction
+    graph.transitive_reduction()
+    rng = random.Random(seed)
+    ids = list(graph.operations)
+    pairs = [(rng.choice(ids), rng.choice(ids)) for _ in range(queries)]
+    index, build = timed(ReachabilityIndex, graph.graph)
+    answers, query = timed(lambda: [index.has_path(s, t) for s, t in pairs])
+    baseline = None
+    if not skip_networkx:
+        expected, baseline = timed(lambda: [nx.has_path(graph.graph, s, t) for s, t in pairs])
+        assert answers == expected, "reachability index differs from networkx"
+    report("index build", build)
+    report(f"{queries} has_path queries", query, baseline)
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Time the dependency graph pipeline on a synthetic OpenAPI spec"
+    )
+    parser.add_argument('--operations', '-n', type=int, default=1200,
+                        help='Operations in the synthetic spec (default: 1200)')
+    parser.add_argument('--seed', type=int, default=7, help='Random seed (default: 7)')
+    parser.add_argument('--queries', type=int, default=3000,
+                        help='Random has_path queries (default: 3000)')
+    parser.add_argument('--skip-networkx', action='store_true',
+                        help='Skip the networkx baselines (slow on large specs)')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("DEPENDENCY GRAPH BENCHMARK")
+    print("=" * 70)
+    run(args.operations, args.seed, args.queries, args.skip_networkx)
+
+
+if __name__ == "__main__":
+    main()
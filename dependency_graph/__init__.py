@@ -2,6 +2,8 @@
 Top-level package interface. Keep same external API as previous single-file module.
 """
 
+from typing import Optional
+
 from .complete_builder import CompleteDependencyGraphBuilder
 from .builder import DependencyGraphBuilder
 from .core import DependencyGraph
@@ -14,18 +16,22 @@ from .dependency import Dependency
 from .operation import Operation
 from .parameter import Parameter
 from .response import Response
-from .enums import DependencyType, HTTPMethod
+from .enums import DependencyType, HTTPMethod, OperationRole
+from .refs import DocumentStore
 
 def build_dependency_graph_from_openapi(
     spec_path: str,
     enable_dynamic: bool = False,
     export_results: bool = True,
-    output_dir: str = './output'
+    output_dir: str = './output',
+    documents: Optional[DocumentStore] = None
 ) -> DependencyGraph:
     """
     Backwards-compatible wrapper to build dependency graph from OpenAPI specification.
+    Pass one DocumentStore to several calls to load files their specs share only once.
     """
-    builder = CompleteDependencyGraphBuilder(spec_path, enable_dynamic_updates=enable_dynamic)
+    builder = CompleteDependencyGraphBuilder(spec_path, enable_dynamic_updates=enable_dynamic,
+                                             documents=documents)
     graph = builder.build_complete_graph()
     
     if export_results:
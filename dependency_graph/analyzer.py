@@ -9,8 +9,15 @@ class GraphAnalyzer:
     def __init__(self, graph: DependencyGraph):
         self.graph = graph
     
+    @property
+    def nx_graph(self) -> nx.DiGraph:
+        """Read-only networkx view (materialized on demand for compacted graphs)"""
+        return self.graph.networkx_view()
+    
     def analyze(self) -> Dict[str, Any]:
         """Comprehensive graph analysis"""
+        # Hold the view for the whole analysis so a compacted graph is materialized once
+        view = self.nx_graph
         analysis = {
             'basic_stats': self._basic_statistics(),
             'complexity_metrics': self._complexity_metrics(),
@@ -19,6 +26,7 @@ class GraphAnalyzer:
             'bottlenecks': self._find_bottlenecks(),
             'recommendations': self._generate_recommendations()
         }
+        del view
         
         return analysis
     
@@ -27,23 +35,23 @@ class GraphAnalyzer:
         return {
             'num_operations': len(self.graph.operations),
             'num_dependencies': len(self.graph.dependencies),
-            'num_edges': self.graph.graph.number_of_edges(),
-            'graph_density': nx.density(self.graph.graph),
-            'is_dag': nx.is_directed_acyclic_graph(self.graph.graph),
-            'num_cycles': len(self.graph.detect_cycles()) if not nx.is_directed_acyclic_graph(self.graph.graph) else 0
+            'num_edges': self.nx_graph.number_of_edges(),
+            'graph_density': nx.density(self.nx_graph),
+            'is_dag': nx.is_directed_acyclic_graph(self.nx_graph),
+            'num_cycles': len(self.graph.detect_cycles()) if not nx.is_directed_acyclic_graph(self.nx_graph) else 0
         }
     
     def _complexity_metrics(self) -> Dict[str, Any]:
         """Calculate complexity metrics"""
         # Maximum depth
-        if nx.is_directed_acyclic_graph(self.graph.graph):
-            max_depth = nx.dag_longest_path_length(self.graph.graph)
+        if nx.is_directed_acyclic_graph(self.nx_graph):
+            max_depth = nx.dag_longest_path_length(self.nx_graph)
         else:
             max_depth = -1
         
         # Average dependencies per operation
-        in_degrees = [d for n, d in self.graph.graph.in_degree()]
-        out_degrees = [d for n, d in self.graph.graph.out_degree()]
+        in_degrees = [d for n, d in self.nx_graph.in_degree()]
+        out_degrees = [d for n, d in self.nx_graph.out_degree()]
         
         return {
             'max_sequence_depth': max_depth,
@@ -57,10 +65,10 @@ class GraphAnalyzer:
         """Find critical paths in the graph"""
         critical_paths = []
         
-        if nx.is_directed_acyclic_graph(self.graph.graph):
+        if nx.is_directed_acyclic_graph(self.nx_graph):
             # Find longest path
             try:
-                longest = nx.dag_longest_path(self.graph.graph)
+                longest = nx.dag_longest_path(self.nx_graph)
                 critical_paths.append(longest)
             except:
                 pass
@@ -70,7 +78,7 @@ class GraphAnalyzer:
     def _find_clusters(self) -> List[Set[str]]:
         """Find strongly connected components / clusters"""
         # Convert to undirected for community detection
-        undirected = self.graph.graph.to_undirected()
+        undirected = self.nx_graph.to_undirected()
         
         # Use networkx community detection
         try:
@@ -82,7 +90,7 @@ class GraphAnalyzer:
     
     def _find_bottlenecks(self) -> List[str]:
         """Find bottleneck operations (high betweenness centrality)"""
-        betweenness = nx.betweenness_centrality(self.graph.graph)
+        betweenness = nx.betweenness_centrality(self.nx_graph)
         
         # Get top 10% as bottlenecks
         threshold = sorted(betweenness.values(), reverse=True)[int(len(betweenness) * 0.1)]
@@ -0,0 +1,79 @@
+from typing import Dict, List, Tuple
+from .operation import Operation
+from .dependency import Dependency
+from .enums import HTTPMethod
+
+# Key of the hub for operations that have no security requirement but likely need auth
+HEURISTIC_KEY = ('heuristic',)
+
+def security_key(operation: Operation) -> Tuple[str, ...]:
+    """Sorted security scheme names an operation requires (empty for an optional/anonymous requirement)"""
+    return tuple(sorted({name for requirement in operation.security for name in requirement}))
+
+def make_auth_hub(key: Tuple[str, ...]) -> Operation:
+    """
+    Virtual 'authenticated' node for one security scheme group. Auth operations
+    point at the hub and the group's protected operations hang off it, so the
+    graph carries auth + protected edges instead of auth x protected.
+    """
+    operation_id = f"authenticated[{','.join(key)}]"
+    return Operation(
+        operation_id=operation_id,
+        path='',
+        method=HTTPMethod.GET,
+        annotations={'auth_hub': list(key)}
+    )
+
+def is_auth_hub(operation: Operation) -> bool:
+    return 'auth_hub' in operation.annotations
+
+def expand_auth_hubs(graph):
+    """
+    Copy of a DependencyGraph with every auth hub replaced by concrete edges:
+    each auth -> hub -> protected path becomes auth -> protected, carrying the
+    hub -> protected dependency's confidence and reason. Where an edge between
+    the two operations already exists it is kept as is. The copy is acyclic
+    whenever the graph is, because every new edge follows an existing path, and
+    it is transitively reduced like a built graph.
+    """
+    from .core import DependencyGraph
+
+    expanded = DependencyGraph(incremental_cycle_check=True)
+    for operation in graph.operations.values():
+        if not is_auth_hub(operation):
+            expanded.add_operation(operation)
+
+    dependencies: List[Dependency] = []
+    pairs = set()
+    hub_inputs: Dict[str, List[Dependency]] = {}
+    hub_outputs: Dict[str, List[Dependency]] = {}
+    for dep in graph.dependencies:
+        if is_auth_hub(dep.target):
+            hub_inputs.setdefault(dep.target.operation_id, []).append(dep)
+        elif is_auth_hub(dep.source):
+            hub_outputs.setdefault(dep.source.operation_id, []).append(dep)
+        else:
+            dependencies.append(dep)
+            pairs.add((dep.source.operation_id, dep.target.operation_id))
+
+    for hub_id, outputs in hub_outputs.items():
+        for into_hub in hub_inputs.get(hub_id, ()):
+            auth_op = into_hub.source
+            for out_of_hub in outputs:
+                pair = (auth_op.operation_id, out_of_hub.target.operation_id)
+                if auth_op is out_of_hub.target or pair in pairs:
+                    continue
+                pairs.add(pair)
+                dependencies.append(Dependency(
+                    source=auth_op,
+                    target=out_of_hub.target,
+                    type=out_of_hub.type,
+                    reason=out_of_hub.reason,
+                    confidence=out_of_hub.confidence,
+                    constraint=out_of_hub.constraint,
+                    verified=out_of_hub.verified
+                ))
+
+    expanded.add_dependencies_bulk(dependencies)
+    expanded.transitive_reduction()
+    return expanded
@@ -1,23 +1,58 @@
-from typing import List, Tuple, Dict, Any
+import time
+from functools import partial
+from typing import List, Tuple, Dict, Any, Callable, Optional
 from .parser import OpenAPIParser
+from .refs import DocumentStore
 from .core import DependencyGraph
 from .parameter_analyzer import ParameterDependencyAnalyzer
 from .crud_analyzer import CRUDDependencyAnalyzer
 from .logical_analyzer import LogicalDependencyAnalyzer
 from .nested_analyzer import NestedResourceAnalyzer
 from .constraint_analyzer import ConstraintDependencyAnalyzer
-from .transitive_analyzer import TransitiveDependencyAnalyzer
+from .parallel import run_analyzers_parallel
 from .dependency import Dependency
+from .merge import DependencyMerger, DependencyLike, DependencyColumns
 from .enums import DependencyType
-import networkx as nx
 
 class DependencyGraphBuilder:
     """Main builder for constructing the dependency graph"""
     
-    def __init__(self, spec_path: str):
+    # Step 3 analyzers in merge order: (build_stats key, label, class)
+    ANALYZERS = [
+        ('parameter', 'Parameter-wise', ParameterDependencyAnalyzer),
+        ('crud', 'CRUD', CRUDDependencyAnalyzer),
+        ('logical', 'Logical', LogicalDependencyAnalyzer),
+        ('nested_resource', 'Nested resource', NestedResourceAnalyzer),
+        ('constraint', 'Constraint', ConstraintDependencyAnalyzer),
+    ]
+    
+    # Lower number = stronger semantic meaning; unknown types rank 99
+    TYPE_PRIORITY = {
+        DependencyType.CRUD: 0,
+        DependencyType.AUTHENTICATION: 1,
+        DependencyType.AUTHORIZATION: 1,
+        DependencyType.WORKFLOW: 2,
+        DependencyType.NESTED_RESOURCE: 2,
+        DependencyType.CONSTRAINT: 3,
+        DependencyType.PARAMETER_DATA: 4,
+        DependencyType.TRANSITIVE: 5,
+        DependencyType.DYNAMIC: 5,
+    }
+    
+    def __init__(self, spec_path: str, parallel_analyzers: bool = False,
+                 max_workers: Optional[int] = None, auth_hubs: bool = False,
+                 lazy_parsing: bool = False, documents: Optional[DocumentStore] = None):
         self.spec_path = spec_path
-        self.parser = OpenAPIParser(spec_path)
-        self.graph = DependencyGraph()
+        # Run the Step 3 analyzers in a process pool; the resulting graph is the same
+        self.parallel_analyzers = parallel_analyzers
+        self.max_workers = max_workers
+        # Model authentication as one virtual hub node per security group; exports
+        # expand the hubs back into concrete edges (see auth_hubs.expand_auth_hubs)
+        self.auth_hubs = auth_hubs
+        # Stream path items and drop raw schemas after extraction (lower peak memory)
+        # documents: store shared with other builds (e.g. specs using one component library)
+        self.parser = OpenAPIParser(spec_path, documents, lazy=lazy_parsing)
+        self.graph = DependencyGraph(incremental_cycle_check=True)
         self.operations: List = []
         
         # Statistics tracking for edge reduction pipeline
@@ -27,8 +62,11 @@ class DependencyGraphBuilder:
             'after_cycle_prevention': 0,     # After adding to graph (acyclic check)
             'after_transitive_reduction': 0, # Final edge count
             'skipped_for_cycles': 0,         # Edges skipped to prevent cycles
+            'skipped_by_type': {},           # Skipped edges per dependency type
             'removed_by_reduction': 0,       # Edges removed by transitive reduction
-            'by_analyzer': {}                # Breakdown by analyzer type
+            'by_analyzer': {}                # Per analyzer: {'dependencies': count, 'seconds': wall time of
+                                             # analysis plus merging (same in both modes),
+                                             # 'suppressed': edges cut by fan-out caps}
         }
         
     def build(self) -> DependencyGraph:
@@ -42,68 +80,58 @@ class DependencyGraphBuilder:
             self.graph.add_operation(op)
         
         print("\nStep 3: Analyzing dependencies...")
-        all_dependencies = []
-        
-        # Parameter-wise dependencies
-        print("  - Parameter-wise dependencies...")
-        param_analyzer = ParameterDependencyAnalyzer(self.operations)
-        param_deps = param_analyzer.analyze()
-        all_dependencies.extend(param_deps)
-        print(f"    Found {len(param_deps)} dependencies")
-        self.build_stats['by_analyzer']['parameter'] = len(param_deps)
-        
-        # CRUD dependencies
-        print("  - CRUD dependencies...")
-        crud_analyzer = CRUDDependencyAnalyzer(self.operations)
-        crud_deps = crud_analyzer.analyze()
-        all_dependencies.extend(crud_deps)
-        print(f"    Found {len(crud_deps)} dependencies")
-        self.build_stats['by_analyzer']['crud'] = len(crud_deps)
-        
-        # Logical dependencies
-        print("  - Logical dependencies...")
-        logical_analyzer = LogicalDependencyAnalyzer(self.operations)
-        logical_deps = logical_analyzer.analyze()
-        all_dependencies.extend(logical_deps)
-        print(f"    Found {len(logical_deps)} dependencies")
-        self.build_stats['by_analyzer']['logical'] = len(logical_deps)
-        
-        # Nested resource dependencies
-        print("  - Nested resource dependencies...")
-        nested_analyzer = NestedResourceAnalyzer(self.operations)
-        nested_deps = nested_analyzer.analyze()
-        all_dependencies.extend(nested_deps)
-        print(f"    Found {len(nested_deps)} dependencies")
-        self.build_stats['by_analyzer']['nested_resource'] = len(nested_deps)
-        
-        # Constraint dependencies
-        print("  - Constraint dependencies...")
-        constraint_analyzer = ConstraintDependencyAnalyzer(self.operations)
-        constraint_deps = constraint_analyzer.analyze()
-        all_dependencies.extend(constraint_deps)
-        print(f"    Found {len(constraint_deps)} dependencies")
-        self.build_stats['by_analyzer']['constraint'] = len(constraint_deps)
+        # Analyzers stream lightweight records straight into the merger, so only one
+        # merged Dependency per (source, target) pair is ever held in memory
+        merger = DependencyMerger(self._dependency_priority)
+        
+        analyzers = self._analyzer_factories()
+        if self.parallel_analyzers:
+            results = run_analyzers_parallel(
+                self.operations, [factory for _, _, factory in analyzers], self.max_workers)
+        else:
+            results = None
+        
+        for i, (name, label, analyzer_cls) in enumerate(analyzers):
+            print(f"  - {label} dependencies...")
+            if results is not None:
+                # Worker analysis time plus merging here, as in the serial path
+                records, elapsed, suppressed = results[i]
+                start = time.perf_counter()
+                count = merger.add_all(records)
+                elapsed += time.perf_counter() - start
+            else:
+                start = time.perf_counter()
+                analyzer = analyzer_cls(self.operations)
+                count = merger.add_all(analyzer.iter_dependencies())
+                elapsed = time.perf_counter() - start
+                suppressed = getattr(analyzer, 'suppressed_edges', 0)
+            if suppressed:
+                print(f"    Found {count} dependencies ({suppressed} suppressed by fan-out caps)")
+            else:
+                print(f"    Found {count} dependencies")
+            self.build_stats['by_analyzer'][name] = {'dependencies': count, 'seconds': elapsed,
+                                                     'suppressed': suppressed}
         
         # Track raw dependencies total
-        self.build_stats['raw_dependencies'] = len(all_dependencies)
+        self.build_stats['raw_dependencies'] = merger.count
         
         print("\nStep 4: Resolving conflicts and adding to graph...")
-        resolved_deps = self._resolve_conflicts(all_dependencies)
         # Prefer higher-level semantics (CRUD/auth) over raw parameter matching
-        resolved_deps.sort(key=self._dependency_priority)
+        resolved_deps = self._resolve_bidirectional_conflicts(merger.drain(), by_priority=True)
         print(f"  Resolved to {len(resolved_deps)} dependencies")
         self.build_stats['after_conflict_resolution'] = len(resolved_deps)
         
-        added_count = 0
-        skipped_count = 0
-        for dep in resolved_deps:
-            if self.graph.add_dependency_if_acyclic(dep):
-                added_count += 1
-            else:
-                skipped_count += 1
+        if self.auth_hubs:
+            hubs = self._add_virtual_operations(resolved_deps)
+            print(f"  Added {hubs} authentication hub nodes")
+        
+        accepted, rejected, rejected_by_type = self.graph.add_dependencies_bulk(resolved_deps)
+        added_count = len(accepted)
+        skipped_count = len(rejected)
         print(f"  Added {added_count} dependencies, skipped {skipped_count} to prevent cycles.")
         self.build_stats['after_cycle_prevention'] = added_count
         self.build_stats['skipped_for_cycles'] = skipped_count
+        self.build_stats['skipped_by_type'] = rejected_by_type
         
         # print("\nStep 5: Computing transitive dependencies...")
         # transitive_analyzer = TransitiveDependencyAnalyzer(self.graph)
@@ -121,12 +149,9 @@ class DependencyGraphBuilder:
         print("\nStep 5: Performing transitive reduction to remove redundant edges...")
         initial_edge_count = self.graph.graph.number_of_edges()
         
-        # This is the core of the fix. nx.transitive_reduction creates a new graph
-        # with all redundant (transitive) edges removed.
-        reduced_graph = nx.transitive_reduction(self.graph.graph)
-        
-        # Replace the old graph with the new, cleaner, reduced graph.
-        self.graph.graph = reduced_graph
+        # Remove redundant (transitive) edges in place. Edge attributes survive and the
+        # Dependency list is pruned to match, so exporters only see the reduced edges.
+        self.graph.transitive_reduction()
         
         final_edge_count = self.graph.graph.number_of_edges()
         print(f"  Graph optimized. Reduced edge count from {initial_edge_count} to {final_edge_count}.")
@@ -135,133 +160,49 @@ class DependencyGraphBuilder:
         self.build_stats['after_transitive_reduction'] = final_edge_count
         self.build_stats['removed_by_reduction'] = initial_edge_count - final_edge_count
         
+        # Freeze reachability so has_path / get_operation_sequence queries are O(1)
+        self.graph.build_reachability_index()
+        
         return self.graph
     
-    def _resolve_conflicts(self, dependencies: List[Dependency]) -> List[Dependency]:
-        """Resolve conflicting dependencies including bidirectional conflicts"""
-        # First, group by same direction (source, target)
-        dep_map: Dict[Tuple[str, str], List[Dependency]] = {}
-        
+    def _analyzer_factories(self) -> List[Tuple[str, str, Callable]]:
+        """ANALYZERS with build options bound into the constructors that take them"""
+        if not self.auth_hubs:
+            return list(self.ANALYZERS)
+        return [(name, label, partial(cls, auth_hubs=True) if cls is LogicalDependencyAnalyzer else cls)
+                for name, label, cls in self.ANALYZERS]
+    
+    def _add_virtual_operations(self, dependencies: List[Dependency]) -> int:
+        """Add graph nodes for operations created by the analyzers (auth hubs); returns how many"""
+        added = 0
         for dep in dependencies:
-            key = (dep.source.operation_id, dep.target.operation_id)
-            if key not in dep_map:
-                dep_map[key] = []
-            dep_map[key].append(dep)
-        
-        # Merge same-direction dependencies
-        merged = {}
-        for key, deps in dep_map.items():
-            if len(deps) == 1:
-                merged[key] = deps[0]
-            else:
-                merged[key] = self._merge_dependencies(deps)
-        
-        # Now resolve bidirectional conflicts (A→B vs B→A)
-        resolved = self._resolve_bidirectional_conflicts(merged)
-        
-        return resolved
+            for op in (dep.source, dep.target):
+                if op.operation_id not in self.graph.operations:
+                    self.graph.add_operation(op)
+                    added += 1
+        return added
     
-    def _resolve_bidirectional_conflicts(self, dep_map: Dict[Tuple[str, str], Dependency]) -> List[Dependency]:
+    def _resolve_bidirectional_conflicts(self, dep_map: Dict[Tuple[str, str], Any],
+                                         by_priority: bool = False) -> List[Dependency]:
         """
         Resolve conflicts where we have both A→B and B→A.
         Keep the one with stronger semantic type (CRUD/auth beats parameter_data).
-        """
-        resolved = []
-        processed = set()
         
-        type_priority = {
-            DependencyType.CRUD: 0,
-            DependencyType.AUTHENTICATION: 1,
-            DependencyType.AUTHORIZATION: 1,
-            DependencyType.WORKFLOW: 2,
-            DependencyType.NESTED_RESOURCE: 2,
-            DependencyType.CONSTRAINT: 3,
-            DependencyType.PARAMETER_DATA: 4,
-            DependencyType.TRANSITIVE: 5,
-            DependencyType.DYNAMIC: 5,
-        }
-        
-        for (src, tgt), dep in dep_map.items():
-            if (src, tgt) in processed:
-                continue
-            
-            reverse_key = (tgt, src)
-            if reverse_key in dep_map:
-                # Bidirectional conflict! Choose the better one
-                reverse_dep = dep_map[reverse_key]
-                
-                dep_priority = type_priority.get(dep.type, 99)
-                rev_priority = type_priority.get(reverse_dep.type, 99)
-                
-                # Lower priority number = stronger semantic meaning
-                if dep_priority < rev_priority:
-                    resolved.append(dep)
-                elif rev_priority < dep_priority:
-                    resolved.append(reverse_dep)
-                else:
-                    # Same type priority - use confidence
-                    if dep.confidence >= reverse_dep.confidence:
-                        resolved.append(dep)
-                    else:
-                        resolved.append(reverse_dep)
-                
-                processed.add((src, tgt))
-                processed.add(reverse_key)
-            else:
-                # No conflict
-                resolved.append(dep)
-                processed.add((src, tgt))
+        dep_map may hold DependencyMerger.drain() state; only the surviving
+        entries are turned into Dependencies. With by_priority the result is
+        ordered by _dependency_priority instead of first-seen order.
+        """
+        columns = DependencyColumns(dep_map, self.TYPE_PRIORITY)
+        rows = columns.resolve_bidirectional()
+        if by_priority:
+            rows = columns.priority_order(rows)
         
-        return resolved
+        states = list(dep_map.values())
+        return [DependencyMerger.finalize(states[row]) for row in rows.tolist()]
     
-    def _merge_dependencies(self, deps: List[Dependency]) -> Dependency:
-        """Merge multiple dependencies into one, preferring stronger semantic types"""
-        # Sort by type priority first (stronger semantic types first), then confidence
-        type_priority = {
-            DependencyType.CRUD: 0,
-            DependencyType.AUTHENTICATION: 1,
-            DependencyType.AUTHORIZATION: 1,
-            DependencyType.WORKFLOW: 2,
-            DependencyType.NESTED_RESOURCE: 2,
-            DependencyType.CONSTRAINT: 3,
-            DependencyType.PARAMETER_DATA: 4,
-            DependencyType.TRANSITIVE: 5,
-            DependencyType.DYNAMIC: 5,
-        }
-        
-        deps_sorted = sorted(deps, key=lambda d: (type_priority.get(d.type, 99), -d.confidence))
-        base = deps_sorted[0]
-        
-        # Take the highest confidence value
-        max_confidence = max(d.confidence for d in deps)
-        base.confidence = max_confidence
-        
-        # Merge parameter mappings
-        merged_params = {}
-        for dep in reversed(deps_sorted):
-            merged_params.update(dep.parameter_mapping)
-        base.parameter_mapping = merged_params
-
-        # Combine reasons
-        reasons = {d.reason for d in deps if d.reason}
-        base.reason = "; ".join(sorted(list(reasons)))
-        
-        return base
-
-    def _dependency_priority(self, dep: Dependency) -> tuple:
+    def _dependency_priority(self, dep: DependencyLike) -> tuple:
         """
         Sort dependencies so stronger semantic signals are added first.
         This prevents low-level parameter matches from blocking CRUD ordering.
         """
-        type_priority = {
-            DependencyType.CRUD: 0,
-            DependencyType.AUTHENTICATION: 1,
-            DependencyType.AUTHORIZATION: 1,
-            DependencyType.WORKFLOW: 2,
-            DependencyType.NESTED_RESOURCE: 2,
-            DependencyType.CONSTRAINT: 3,
-            DependencyType.PARAMETER_DATA: 4,
-            DependencyType.TRANSITIVE: 5,
-            DependencyType.DYNAMIC: 5,
-        }
-        return (type_priority.get(dep.type, 99), -dep.confidence)
\ No newline at end of file
+        return (self.TYPE_PRIORITY.get(dep.type, 99), -dep.confidence)
\ No newline at end of file
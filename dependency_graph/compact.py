@@ -0,0 +1,182 @@
+import math
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional
+import networkx as nx
+from .enums import DependencyType
+from .operation import Operation
+
+# Dense codes for the 'type' edge attribute (-1 = attribute absent)
+_TYPE_CODES = {dep_type.value: code for code, dep_type in enumerate(DependencyType)}
+_TYPE_VALUES = [dep_type.value for dep_type in DependencyType]
+_VERIFIED_CODES = {False: 0, True: 1}
+
+# Edge attributes with a dedicated column; anything else goes to edge_extra
+_COLUMN_ATTRS = ('weight', 'type', 'confidence', 'reason', 'verified')
+
+class CompactGraph:
+    """
+    Frozen, integer-indexed storage for a DependencyGraph's edges.
+
+    Operation ids are interned to dense ints (their position in node_ids).
+    Out-edges are stored in CSR form (out_offsets/out_targets, each row sorted
+    by target index) and in-edges in CSC form (in_offsets/in_sources, with
+    in_edges pointing back at the CSR position). The edge attributes the
+    builder writes - weight, type, confidence, reason, verified - live in
+    parallel columns ordered like out_targets. Node attributes are not stored;
+    they are regenerated from Operation.get_summary() when a networkx graph is
+    materialized.
+    """
+
+    def __init__(self, graph: nx.DiGraph, operations: Dict[str, Operation]):
+        self.node_ids: List[str] = list(graph.nodes)
+        self.node_index: Dict[str, int] = {node: i for i, node in enumerate(self.node_ids)}
+        # Node attributes that differ from the operation summary (normally empty)
+        self.node_extra: Dict[int, Dict[str, Any]] = {}
+
+        self.out_offsets = array('i', [0])
+        self.out_targets = array('i')
+        self.edge_weight = array('d')
+        self.edge_type = array('b')
+        self.edge_confidence = array('d')
+        self.edge_verified = array('b')
+        self.edge_reason: List[Optional[str]] = []
+        self.edge_extra: Dict[int, Dict[str, Any]] = {}
+
+        index = self.node_index
+        for i, node in enumerate(self.node_ids):
+            data = graph._node[node]
+            operation = operations.get(node)
+            if operation is None or data != operation.get_summary():
+                self.node_extra[i] = dict(data)
+
+            for target, attrs in sorted(graph.succ[node].items(), key=lambda kv: index[kv[0]]):
+                self._append_edge(index[target], attrs)
+            self.out_offsets.append(len(self.out_targets))
+
+        self._build_csc()
+
+    def _append_edge(self, target: int, attrs: Dict[str, Any]):
+        """Append one CSR edge and split its attributes into the columns."""
+        position = len(self.out_targets)
+        self.out_targets.append(target)
+        self.edge_weight.append(attrs.get('weight', math.nan))
+        self.edge_type.append(_TYPE_CODES.get(attrs.get('type'), -1))
+        self.edge_confidence.append(attrs.get('confidence', math.nan))
+        self.edge_verified.append(_VERIFIED_CODES.get(attrs.get('verified'), -1))
+        self.edge_reason.append(attrs.get('reason'))
+
+        extra = {k: v for k, v in attrs.items() if k not in _COLUMN_ATTRS}
+        if 'type' in attrs and attrs['type'] not in _TYPE_CODES:
+            extra['type'] = attrs['type']
+        if 'verified' in attrs and attrs['verified'] not in _VERIFIED_CODES:
+            extra['verified'] = attrs['verified']
+        if extra:
+            self.edge_extra[position] = extra
+
+    def _build_csc(self):
+        """Derive the in-edge (CSC) arrays from the CSR arrays with a counting sort."""
+        num_nodes = len(self.node_ids)
+        counts = [0] * (num_nodes + 1)
+        for target in self.out_targets:
+            counts[target + 1] += 1
+        for i in range(num_nodes):
+            counts[i + 1] += counts[i]
+        self.in_offsets = array('i', counts)
+
+        fill = list(counts[:-1])
+        self.in_sources = array('i', bytes(4 * len(self.out_targets)))
+        self.in_edges = array('i', bytes(4 * len(self.out_targets)))
+        for source in range(num_nodes):
+            for position in range(self.out_offsets[source], self.out_offsets[source + 1]):
+                target = self.out_targets[position]
+                slot = fill[target]
+                self.in_sources[slot] = source
+                self.in_edges[slot] = position
+                fill[target] += 1
+
+    def number_of_nodes(self) -> int:
+        return len(self.node_ids)
+
+    def number_of_edges(self) -> int:
+        return len(self.out_targets)
+
+    def successors(self, node: str) -> List[str]:
+        i = self.node_index[node]
+        return [self.node_ids[t] for t in self.out_targets[self.out_offsets[i]:self.out_offsets[i + 1]]]
+
+    def predecessors(self, node: str) -> List[str]:
+        i = self.node_index[node]
+        return [self.node_ids[s] for s in self.in_sources[self.in_offsets[i]:self.in_offsets[i + 1]]]
+
+    def out_degree(self, node: str) -> int:
+        i = self.node_index[node]
+        return self.out_offsets[i + 1] - self.out_offsets[i]
+
+    def in_degree(self, node: str) -> int:
+        i = self.node_index[node]
+        return self.in_offsets[i + 1] - self.in_offsets[i]
+
+    def _edge_position(self, source: str, target: str) -> int:
+        """CSR position of source->target, or -1 if there is no such edge."""
+        u = self.node_index.get(source)
+        v = self.node_index.get(target)
+        if u is None or v is None:
+            return -1
+        lo, hi = self.out_offsets[u], self.out_offsets[u + 1]
+        position = bisect_left(self.out_targets, v, lo, hi)
+        if position < hi and self.out_targets[position] == v:
+            return position
+        return -1
+
+    def has_edge(self, source: str, target: str) -> bool:
+        return self._edge_position(source, target) >= 0
+
+    def edge_attributes(self, source: str, target: str) -> Dict[str, Any]:
+        """Attribute dict of one edge, as networkx would return it."""
+        position = self._edge_position(source, target)
+        if position < 0:
+            raise KeyError((source, target))
+        return self._edge_data(position)
+
+    def _edge_data(self, position: int) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        if not math.isnan(self.edge_weight[position]):
+            data['weight'] = self.edge_weight[position]
+        if self.edge_type[position] >= 0:
+            data['type'] = _TYPE_VALUES[self.edge_type[position]]
+        if not math.isnan(self.edge_confidence[position]):
+            data['confidence'] = self.edge_confidence[position]
+        if self.edge_reason[position] is not None:
+            data['reason'] = self.edge_reason[position]
+        data.update(self.edge_extra.get(position, ()))
+        if self.edge_verified[position] >= 0:
+            data['verified'] = bool(self.edge_verified[position])
+        return data
+
+    def to_networkx(self, operations: Dict[str, Operation]) -> nx.DiGraph:
+        """Materialize an equivalent networkx DiGraph (node summaries come from operations)."""
+        graph = nx.DiGraph()
+        for i, node in enumerate(self.node_ids):
+            if i in self.node_extra:
+                graph.add_node(node, **self.node_extra[i])
+            else:
+                graph.add_node(node, **operations[node].get_summary())
+        node_ids = self.node_ids
+        graph.add_edges_from(
+            (node_ids[u], node_ids[self.out_targets[position]], self._edge_data(position))
+            for u in range(len(node_ids))
+            for position in range(self.out_offsets[u], self.out_offsets[u + 1])
+        )
+        return graph
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the compact structure (shared strings excluded)."""
+        total = sys.getsizeof(self.node_ids) + sys.getsizeof(self.node_index)
+        total += sys.getsizeof(self.edge_reason) + sys.getsizeof(self.edge_extra)
+        for column in (self.out_offsets, self.out_targets, self.in_offsets, self.in_sources,
+                       self.in_edges, self.edge_weight, self.edge_type,
+                       self.edge_confidence, self.edge_verified):
+            total += column.buffer_info()[1] * column.itemsize
+        return total
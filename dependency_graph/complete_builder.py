@@ -2,7 +2,7 @@ import os
 import sys
 import time
 from io import StringIO
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from .builder import DependencyGraphBuilder
 from .dynamic_manager import DynamicDependencyManager
 from .analyzer import GraphAnalyzer
@@ -11,6 +11,8 @@ from .exporter import AnnotationExporter
 from .core import DependencyGraph
 from .parser import OpenAPIParser
 from .stats import GraphStatistics
+from .auth_hubs import expand_auth_hubs
+from .refs import DocumentStore, load_document
 
 
 class TeeOutput:
@@ -39,9 +41,15 @@ class CompleteDependencyGraphBuilder:
     from OpenAPI specifications with dynamic updates
     """
     
-    def __init__(self, spec_path: str, enable_dynamic_updates: bool = False):
+    def __init__(self, spec_path: str, enable_dynamic_updates: bool = False,
+                 parallel_analyzers: bool = False, auth_hubs: bool = False,
+                 lazy_parsing: bool = False, documents: Optional[DocumentStore] = None):
         self.spec_path = spec_path
         self.enable_dynamic_updates = enable_dynamic_updates
+        self.parallel_analyzers = parallel_analyzers
+        self.auth_hubs = auth_hubs
+        self.lazy_parsing = lazy_parsing
+        self.documents = documents
         
         # Core components
         self.parser: Optional[OpenAPIParser] = None
@@ -50,6 +58,8 @@ class CompleteDependencyGraphBuilder:
         self.dynamic_manager: Optional[DynamicDependencyManager] = None
         self.analyzer: Optional[GraphAnalyzer] = None
         self.visualizer: Optional[GraphVisualizer] = None
+        # (graph, graph version, expanded copy) behind export_graph() in auth_hubs mode
+        self._expanded: Optional[Tuple[DependencyGraph, int, DependencyGraph]] = None
         
         # Output capture
         self._captured_output: str = ""
@@ -80,7 +90,11 @@ class CompleteDependencyGraphBuilder:
             # Step 1: Build initial static graph
             print("\n[PHASE 1] Building Static Dependency Graph")
             print("-" * 80)
-            self.builder = DependencyGraphBuilder(self.spec_path)
+            self.builder = DependencyGraphBuilder(self.spec_path,
+                                                  parallel_analyzers=self.parallel_analyzers,
+                                                  auth_hubs=self.auth_hubs,
+                                                  lazy_parsing=self.lazy_parsing,
+                                                  documents=self.documents)
             self.graph = self.builder.build()
             
             # Step 2: Analyze graph
@@ -166,6 +180,9 @@ class CompleteDependencyGraphBuilder:
             conflicts_resolved = raw - after_conflict
             log_content.append(f"    - Conflicts resolved:      {conflicts_resolved} edges merged/removed")
             log_content.append(f"    - Cycles prevented:        {skipped_cycles} edges skipped")
+            for dep_type, count in sorted(stats.get('skipped_by_type', {}).items(),
+                                          key=lambda x: x[1], reverse=True):
+                log_content.append(f"        {dep_type}: {count}")
             log_content.append(f"    - Transitive reduction:    {removed_reduction} redundant edges removed")
             if raw > 0:
                 reduction_pct = ((raw - final) / raw) * 100
@@ -176,8 +193,12 @@ class CompleteDependencyGraphBuilder:
             if by_analyzer:
                 log_content.append("")
                 log_content.append("  By Analyzer:")
-                for analyzer, count in sorted(by_analyzer.items(), key=lambda x: x[1], reverse=True):
-                    log_content.append(f"    - {analyzer}: {count}")
+                for analyzer, info in sorted(by_analyzer.items(),
+                                             key=lambda x: x[1]['dependencies'], reverse=True):
+                    suppressed = info.get('suppressed', 0)
+                    log_content.append(f"    - {analyzer}: {info['dependencies']} "
+                                       f"({info['seconds']:.3f}s)"
+                                       + (f", {suppressed} suppressed" if suppressed else ""))
         else:
             log_content.append("  (Build statistics not available)")
         
@@ -196,10 +217,11 @@ class CompleteDependencyGraphBuilder:
         log_content.append("OPERATION SEQUENCES (Sample)")
         log_content.append("=" * 80)
         
-        # Add sample operation sequences
-        interesting_ops = [op for op in self.graph.operations.values() if op.is_interesting()]
+        # Add sample operation sequences (of the exported graph, like the summary)
+        export_graph = self.export_graph()
+        interesting_ops = [op for op in export_graph.operations.values() if op.is_interesting()]
         for op in interesting_ops[:5]:  # Show top 5 interesting operations
-            sequence = self.graph.get_operation_sequence(op)
+            sequence = export_graph.get_operation_sequence(op)
             log_content.append(f"\nTo execute: {op.method.value} {op.path}")
             log_content.append("  Prerequisites:")
             if len(sequence) > 1:
@@ -258,24 +280,33 @@ class CompleteDependencyGraphBuilder:
             print("\n[EXPORT] Exporting dependency graph...")
             
             # Export annotated OpenAPI spec
-            parser = OpenAPIParser(self.spec_path)
-            original_spec = parser.spec if hasattr(parser, 'spec') else {}
+            # Reuse the build's parser: its loaded spec and its schema cache
+            if self.builder is not None:
+                parser = self.builder.parser
+            else:
+                parser = OpenAPIParser(self.spec_path, self.documents)
+                parser.parse()
+            # A lazy parser holds no paths: the export reads the full spec again
+            original_spec = load_document(self.spec_path) if parser.lazy else parser.spec
+            
+            export_graph = self.export_graph()
+            visualizer = GraphVisualizer(export_graph) if self.auth_hubs else self.visualizer
             
-            exporter = AnnotationExporter(self.graph, original_spec)
+            exporter = AnnotationExporter(export_graph, original_spec, parser)
             exporter.export_annotated_spec(f"{output_dir}/annotated_spec.yaml")
             
             # Export visualizations
-            self.visualizer.export_json(f"{output_dir}/graph.json")
-            self.visualizer.export_graphml(f"{output_dir}/graph.graphml")
-            self.visualizer.export_dot(f"{output_dir}/graph.dot")
-            self.visualizer.visualize_interactive(f"{output_dir}/graph.html")
+            visualizer.export_json(f"{output_dir}/graph.json")
+            visualizer.export_graphml(f"{output_dir}/graph.graphml")
+            visualizer.export_dot(f"{output_dir}/graph.dot")
+            visualizer.visualize_interactive(f"{output_dir}/graph.html")
             
             print(f"\n✓ All exports completed in {output_dir}/")
             
             # Generate and capture graph statistics
             print("\n[STATS] Generating graph statistics...")
             stats = GraphStatistics()
-            stats.generate_report(self.graph, output_dir)
+            stats.generate_report(export_graph, output_dir)
             
         finally:
             # Stop capturing and append to existing output
@@ -284,6 +315,19 @@ class CompleteDependencyGraphBuilder:
         # Save all captured output to a stats text file
         self._save_stats_log(output_dir)
     
+    def export_graph(self) -> DependencyGraph:
+        """
+        The graph as exported and summarized. Auth hubs are a build-time device:
+        in auth_hubs mode this is a copy with the hubs expanded into concrete
+        edges, made once per graph version.
+        """
+        if not self.auth_hubs:
+            return self.graph
+        expanded = self._expanded
+        if expanded is None or expanded[0] is not self.graph or expanded[1] != self.graph.version:
+            expanded = self._expanded = (self.graph, self.graph.version, expand_auth_hubs(self.graph))
+        return expanded[2]
+    
     def get_operation_sequence(self, operation_id: str):
         """Get the complete operation sequence for a given operation"""
         if operation_id not in self.graph.operations:
@@ -292,6 +336,10 @@ class CompleteDependencyGraphBuilder:
         operation = self.graph.operations[operation_id]
         return self.graph.get_operation_sequence(operation)
     
+    def get_sequence_cache_info(self) -> Dict[str, Any]:
+        """Hit/miss counters of the graph's operation sequence cache, for sizing it"""
+        return self.graph.sequence_cache_info()
+    
     def simulate_execution(self, operation_id: str, success: bool, 
                           response: dict, parameters: dict):
         """Simulate operation execution for dynamic learning"""
@@ -305,10 +353,9 @@ class CompleteDependencyGraphBuilder:
         self.dynamic_manager.record_execution(operation, success, response, parameters)
     
     def get_dependency_types_summary(self):
-        """Get summary of dependency types in the graph"""
-        from .dependency import Dependency
+        """Get summary of dependency types in the exported graph (auth hubs expanded)"""
         summary = {}
-        for dep in self.graph.dependencies:
+        for dep in self.export_graph().dependencies:
             if dep.type not in summary:
                 summary[dep.type] = 0
             summary[dep.type] += 1
@@ -1,80 +1,251 @@
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Pattern, Set, Tuple, Iterator
 from .operation import Operation
-from .dependency import Dependency
+from .dependency import Dependency, DependencyRecord
 from .enums import DependencyType, HTTPMethod
+from .constraints import ConstraintCache, Interval, component_name
+from .features import OperationFeatures
 
 class ConstraintDependencyAnalyzer:
     """Analyze constraint-based dependencies"""
     
+    # Most edges one constraint group (e.g. a resource's enum parameter) may emit; the rest
+    # are counted in suppressed_edges. Large resources otherwise yield setters x operations edges.
+    MAX_GROUP_FANOUT = 256
+    
+    # Methods that write a constrained value, and so can satisfy it for other operations
+    WRITE_METHODS = (HTTPMethod.POST, HTTPMethod.PUT, HTTPMethod.PATCH)
+    
     def __init__(self, operations: List[Operation]):
         self.operations = operations
         self.dependencies: List[Dependency] = []
+        self.suppressed_edges = 0
+        # Used only for operations the parser did not build features for
+        self.constraint_cache = ConstraintCache()
+        self._by_resource: Optional[Dict[str, List[Operation]]] = None
     
     def analyze(self) -> List[Dependency]:
         """Find constraint-based dependencies"""
-        dependencies = []
+        self.dependencies = [record.to_dependency() for record in self.iter_dependencies()]
+        return self.dependencies
+    
+    def iter_dependencies(self) -> Iterator[DependencyRecord]:
+        """Yield constraint-based dependencies as lightweight records"""
+        self.suppressed_edges = 0
         
         # Analyze enum constraints
-        dependencies.extend(self._analyze_enum_constraints())
+        yield from self._analyze_enum_constraints()
         
         # Analyze range constraints
-        dependencies.extend(self._analyze_range_constraints())
+        yield from self._analyze_range_constraints()
         
         # Analyze pattern constraints
-        dependencies.extend(self._analyze_pattern_constraints())
+        yield from self._analyze_pattern_constraints()
         
         # Analyze conditional schemas (oneOf, anyOf, allOf)
-        dependencies.extend(self._analyze_conditional_schemas())
-        
-        self.dependencies = dependencies
-        return dependencies
+        yield from self._analyze_conditional_schemas()
     
-    def _analyze_enum_constraints(self) -> List[Dependency]:
-        """Find dependencies based on enum constraints"""
-        dependencies = []
-        
-        # Find operations that set enum values
-        enum_setters: Dict[str, List[Tuple[Operation, str]]] = {}
+    def _resource_index(self) -> Dict[str, List[Operation]]:
+        """Operations by resource; operations without a resource form no group"""
+        if self._by_resource is None:
+            self._by_resource = {}
+            for op in self.operations:
+                if op.resource_type is not None:
+                    self._by_resource.setdefault(op.resource_type, []).append(op)
+        return self._by_resource
+    
+    def _features(self, operation: Operation) -> OperationFeatures:
+        """Compiled constraint tables of an operation, built on first use if the parser did not"""
+        if operation.features is None:
+            operation.features = OperationFeatures.from_operation(operation, self.constraint_cache)
+        return operation.features
+    
+    def _capped_pairs(self, setters: List[Operation],
+                      targets: List[Operation]) -> Iterator[Tuple[Operation, Operation]]:
+        """
+        (setter, target) pairs of one group in target order, without self-links and at
+        most MAX_GROUP_FANOUT of them. The remainder is counted, not enumerated.
+        """
+        target_ids = {id(op) for op in targets}
+        total = len(targets) * len(setters) - sum(1 for op in setters if id(op) in target_ids)
+        emitted = 0
+        for op in targets:
+            for setter_op in setters:
+                if setter_op is op:
+                    continue
+                if emitted == self.MAX_GROUP_FANOUT:
+                    self.suppressed_edges += total - emitted
+                    return
+                yield setter_op, op
+                emitted += 1
+    
+    def _analyze_enum_constraints(self) -> Iterator[DependencyRecord]:
+        """
+        Find dependencies based on enum constraints. Each (setter, target) pair is
+        emitted once, naming every enum parameter the setter sets; a pair already
+        met in an earlier group of the resource does not count against that
+        group's MAX_GROUP_FANOUT.
+        """
+        by_resource = self._resource_index()
+        # Find operations that set enum values, keyed by (resource, parameter)
+        enum_setters: Dict[Tuple[str, str], List[Operation]] = {}
         
         for op in self.operations:
+            if op.resource_type is None:
+                continue
             for param in op.parameters:
                 if 'enum' in param.constraints and param.constraints['enum']:
-                    key = f"{op.resource_type}.{param.name}"
-                    if key not in enum_setters:
-                        enum_setters[key] = []
-                    enum_setters[key].append((op, param.name))
+                    setters = enum_setters.setdefault((op.resource_type, param.name), [])
+                    # A parameter declared twice (e.g. query and body) sets the enum once
+                    if not setters or setters[-1] is not op:
+                        setters.append(op)
         
-        # Find operations that depend on these enum values
-        for key, setters in enum_setters.items():
-            resource_type, param_name = key.split('.')
-            
-            for op in self.operations:
-                if op.resource_type == resource_type:
-                    for setter_op, setter_param in setters:
-                        if setter_op != op:
-                            dep = Dependency(
-                                source=setter_op,
-                                target=op,
-                                type=DependencyType.CONSTRAINT,
-                                confidence=0.6,
-                                constraint=f"enum:{param_name}",
-                                reason=f"Parameter {param_name} has enum constraint"
-                            )
-                            dependencies.append(dep)
+        # Every group of a resource targets all of its operations, so a pair has been
+        # met before exactly when its setter has: id(setter) per resource
+        seen: Dict[str, Set[int]] = {}
+        # (setter, target) -> enum parameter names, for the pairs emitted
+        pairs: Dict[Tuple[int, int], Tuple[Operation, Operation, List[str]]] = {}
+        # id(setter) -> its emitted pairs
+        by_setter: Dict[int, List[Tuple[int, int]]] = {}
         
-        return dependencies
+        # Operations of the same resource depend on these enum values
+        for (resource_type, param_name), setters in enum_setters.items():
+            seen_setters = seen.setdefault(resource_type, set())
+            new_setters = []
+            for setter_op in setters:
+                if id(setter_op) in seen_setters:
+                    for key in by_setter.get(id(setter_op), ()):
+                        pairs[key][2].append(param_name)
+                else:
+                    new_setters.append(setter_op)
+            seen_setters.update(id(op) for op in new_setters)
+            for setter_op, op in self._capped_pairs(new_setters, by_resource[resource_type]):
+                key = (id(setter_op), id(op))
+                pairs[key] = (setter_op, op, [param_name])
+                by_setter.setdefault(key[0], []).append(key)
+        
+        for setter_op, op, names in pairs.values():
+            yield DependencyRecord(
+                source=setter_op,
+                target=op,
+                type=DependencyType.CONSTRAINT,
+                confidence=0.6,
+                constraint=f"enum:{','.join(names)}",
+                reason=(f"Parameter {names[0]} has enum constraint" if len(names) == 1 else
+                        f"Parameters {', '.join(names)} have enum constraints")
+            )
     
-    def _analyze_range_constraints(self) -> List[Dependency]:
+    def _analyze_range_constraints(self) -> Iterator[DependencyRecord]:
         """Find dependencies based on range constraints"""
-        # Similar to enum but for numeric ranges
-        return []
+        by_resource = self._resource_index()
+        # Writers of a bounded numeric parameter, keyed by (resource, parameter, interval)
+        range_setters: Dict[Tuple[str, str, Interval], List[Operation]] = {}
+        for op in self.operations:
+            if op.resource_type is None or op.method not in self.WRITE_METHODS:
+                continue
+            for param_name, interval in self._features(op).ranges.items():
+                range_setters.setdefault((op.resource_type, param_name, interval), []).append(op)
+        
+        # Operations of the resource taking the parameter in an overlapping range
+        for (resource_type, param_name, interval), setters in range_setters.items():
+            targets = []
+            for op in by_resource[resource_type]:
+                features = self._features(op)
+                if param_name not in features.required:
+                    continue
+                declared = features.ranges.get(param_name)
+                if declared is None or declared.overlaps(interval):
+                    targets.append(op)
+            
+            for setter_op, op in self._capped_pairs(setters, targets):
+                yield DependencyRecord(
+                    source=setter_op,
+                    target=op,
+                    type=DependencyType.CONSTRAINT,
+                    confidence=0.5,
+                    constraint=f"range:{param_name}{interval}",
+                    reason=f"Parameter {param_name} has range constraint {interval}"
+                )
     
-    def _analyze_pattern_constraints(self) -> List[Dependency]:
+    def _analyze_pattern_constraints(self) -> Iterator[DependencyRecord]:
         """Find dependencies based on pattern constraints"""
-        # Regex pattern matching for parameters
-        return []
+        by_resource = self._resource_index()
+        # Writers of a pattern-constrained parameter, keyed by (resource, parameter, compiled pattern)
+        pattern_setters: Dict[Tuple[str, str, Pattern], List[Operation]] = {}
+        for op in self.operations:
+            if op.resource_type is None or op.method not in self.WRITE_METHODS:
+                continue
+            for param_name, pattern in self._features(op).patterns.items():
+                if pattern is not None:
+                    pattern_setters.setdefault((op.resource_type, param_name, pattern), []).append(op)
+        
+        # Operations of the resource taking the parameter under the same pattern, or
+        # unconstrained with no example that contradicts it. A pattern re cannot
+        # compile is unknown, not unconstrained: its operations are no targets.
+        for (resource_type, param_name, pattern), setters in pattern_setters.items():
+            targets = []
+            for op in by_resource[resource_type]:
+                features = self._features(op)
+                if param_name not in features.required:
+                    continue
+                if param_name in features.patterns:
+                    if features.patterns[param_name] is pattern:
+                        targets.append(op)
+                else:
+                    example = self._parameter_example(op, param_name)
+                    if example is None or pattern.search(str(example)):
+                        targets.append(op)
+            
+            for setter_op, op in self._capped_pairs(setters, targets):
+                yield DependencyRecord(
+                    source=setter_op,
+                    target=op,
+                    type=DependencyType.CONSTRAINT,
+                    confidence=0.5,
+                    constraint=f"pattern:{param_name}",
+                    reason=f"Parameter {param_name} must match pattern {pattern.pattern}"
+                )
+    
+    @staticmethod
+    def _parameter_example(operation: Operation, param_name: str):
+        """Example of the first declaration of a parameter, from the parameter or its schema"""
+        for param in operation.parameters:
+            if param.name == param_name:
+                if param.example is not None:
+                    return param.example
+                return param.schema.get('example') if isinstance(param.schema, dict) else None
+        return None
     
-    def _analyze_conditional_schemas(self) -> List[Dependency]:
+    def _analyze_conditional_schemas(self) -> Iterator[DependencyRecord]:
         """Find dependencies based on oneOf/anyOf/allOf"""
-        # Complex schema conditional logic
-        return []
\ No newline at end of file
+        # Writers returning each component schema, keyed by (resource, component)
+        producers: Dict[Tuple[str, str], List[Operation]] = {}
+        # Operations whose request body is composed of a component, keyed by (resource, keyword, component)
+        consumers: Dict[Tuple[str, str, str], List[Operation]] = {}
+        
+        for op in self.operations:
+            if op.resource_type is None:
+                continue
+            features = self._features(op)
+            if op.method in self.WRITE_METHODS:
+                for component in features.produced_schemas:
+                    producers.setdefault((op.resource_type, component), []).append(op)
+            if features.request_schema is not None:
+                for keyword, components in features.request_schema.composed:
+                    for component in components:
+                        consumers.setdefault((op.resource_type, keyword, component), []).append(op)
+        
+        for (resource_type, keyword, component), targets in consumers.items():
+            setters = producers.get((resource_type, component))
+            if not setters:
+                continue
+            name = component_name(component)
+            for setter_op, op in self._capped_pairs(setters, targets):
+                yield DependencyRecord(
+                    source=setter_op,
+                    target=op,
+                    type=DependencyType.CONSTRAINT,
+                    confidence=0.5,
+                    constraint=f"{keyword}:{name}",
+                    reason=f"Request body of {op.operation_id} is {keyword} {name}, "
+                           f"produced by {setter_op.operation_id}"
+                )
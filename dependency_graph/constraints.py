@@ -0,0 +1,172 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Optional, Pattern, Set, Tuple
+from .refs import RefResolver
+
+COMPOSITION_KEYWORDS = ('allOf', 'oneOf', 'anyOf')
+
+# Schema types whose minimum/maximum bound the value itself
+NUMERIC_TYPES = ('integer', 'number')
+
+@dataclass(frozen=True, slots=True)
+class Interval:
+    """Closed numeric range of a parameter; None means unbounded on that side."""
+    low: Optional[float] = None
+    high: Optional[float] = None
+
+    def is_empty(self) -> bool:
+        return self.low is not None and self.high is not None and self.low > self.high
+
+    def overlaps(self, other: 'Interval') -> bool:
+        if self.is_empty() or other.is_empty():
+            return False
+        if self.low is not None and other.high is not None and self.low > other.high:
+            return False
+        if other.low is not None and self.high is not None and other.low > self.high:
+            return False
+        return True
+
+    def __str__(self) -> str:
+        low = '-inf' if self.low is None else f"{self.low:g}"
+        high = 'inf' if self.high is None else f"{self.high:g}"
+        return f"[{low}, {high}]"
+
+
+@dataclass(frozen=True, slots=True)
+class FlatSchema:
+    """
+    A schema with $ref and allOf/oneOf/anyOf resolved once.
+    refs: every referenced schema it is, contains through composition, or holds as array items.
+    composed: keyword -> references of its top-level parts.
+    properties: property names of all parts.
+    References are canonical ("<document>#<pointer>", see RefResolver), so
+    same-named schemas of different documents stay apart.
+    """
+    refs: FrozenSet[str] = frozenset()
+    composed: Tuple[Tuple[str, Tuple[str, ...]], ...] = ()
+    properties: FrozenSet[str] = frozenset()
+
+
+def component_name(ref: str) -> str:
+    """Display name of a (canonical) schema reference: the last pointer token"""
+    return ref.split('/')[-1]
+
+
+class ConstraintCache:
+    """
+    Per-spec compilation cache for parameter constraints.
+
+    Each distinct pattern is compiled once (None if re cannot compile it), each
+    distinct (minimum, maximum) pair becomes one shared Interval, and each schema
+    is flattened once: referenced schemas by canonical reference, inline schemas
+    by identity. References are resolved through the parser's RefResolver;
+    without one they are kept as written and resolve to nothing.
+    """
+
+    def __init__(self, resolver: Optional[RefResolver] = None):
+        self.resolver = resolver
+        self._patterns: Dict[str, Optional[Pattern]] = {}
+        self._intervals: Dict[Tuple[Any, Any], Optional[Interval]] = {}
+        self._components: Dict[str, FlatSchema] = {}
+        # id(schema) -> (schema, flattened); the schema is kept so its id is not reused
+        self._inline: Dict[int, Tuple[Dict[str, Any], FlatSchema]] = {}
+        self._resolving: Set[str] = set()
+
+    def release_inline(self):
+        """
+        Forget flattened inline schemas (and the schema dicts kept for them).
+        Operations keep the FlatSchemas they were given; used by the lazy parser
+        between path items.
+        """
+        self._inline.clear()
+
+    def pattern(self, source: Any) -> Optional[Pattern]:
+        if not isinstance(source, str):
+            return None
+        if source not in self._patterns:
+            try:
+                self._patterns[source] = re.compile(source)
+            except re.error:
+                self._patterns[source] = None
+        return self._patterns[source]
+
+    def interval(self, minimum: Any, maximum: Any, schema_type: Any) -> Optional[Interval]:
+        """
+        Interval for a parameter's minimum/maximum, or None if the parameter is not
+        of a numeric type or neither bound is numeric.
+        """
+        if schema_type not in NUMERIC_TYPES:
+            return None
+        key = (minimum, maximum)
+        if key not in self._intervals:
+            low, high = self._number(minimum), self._number(maximum)
+            self._intervals[key] = None if low is None and high is None else Interval(low, high)
+        return self._intervals[key]
+
+    @staticmethod
+    def _number(value: Any) -> Optional[float]:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None
+        return float(value)
+
+    def flatten(self, schema: Any, base: Optional[str] = None) -> FlatSchema:
+        """Flatten a schema of the document at base (the root spec by default)"""
+        if not isinstance(schema, dict):
+            return FlatSchema()
+        ref = schema.get('$ref')
+        if isinstance(ref, str):
+            return self._component(self._canonical(ref, base))
+        cached = self._inline.get(id(schema))
+        if cached is None:
+            cached = self._inline[id(schema)] = (schema, self._flatten_inline(schema, base))
+        return cached[1]
+
+    def _canonical(self, ref: str, base: Optional[str]) -> str:
+        return ref if self.resolver is None else self.resolver.canonical(ref, base)
+
+    def _component(self, key: str) -> FlatSchema:
+        flat = self._components.get(key)
+        if flat is not None:
+            return flat
+        if key in self._resolving:
+            # Recursive schema: the cycle contributes only its reference
+            return FlatSchema(refs=frozenset((key,)))
+        self._resolving.add(key)
+        try:
+            if self.resolver is None:
+                component = None
+            else:
+                component, _ = self.resolver.resolve(key)
+            if not isinstance(component, dict):
+                body = FlatSchema()
+            elif isinstance(component.get('$ref'), str):
+                body = self.flatten(component, self.resolver.document_of(key))
+            else:
+                body = self._flatten_inline(component, self.resolver.document_of(key))
+        finally:
+            self._resolving.discard(key)
+        flat = self._components[key] = FlatSchema(
+            refs=body.refs | {key}, composed=body.composed, properties=body.properties)
+        return flat
+
+    def _flatten_inline(self, schema: Dict[str, Any], base: Optional[str]) -> FlatSchema:
+        refs: Set[str] = set()
+        properties: Set[str] = set(schema.get('properties') or ())
+        composed = []
+        for keyword in COMPOSITION_KEYWORDS:
+            parts = schema.get(keyword)
+            if not isinstance(parts, list):
+                continue
+            names = []
+            for part in parts:
+                flat = self.flatten(part, base)
+                refs |= flat.refs
+                properties |= flat.properties
+                if isinstance(part, dict) and isinstance(part.get('$ref'), str):
+                    names.append(self._canonical(part['$ref'], base))
+            if names:
+                composed.append((keyword, tuple(names)))
+        if schema.get('type') == 'array' and 'items' in schema:
+            refs |= self.flatten(schema['items'], base).refs
+        return FlatSchema(refs=frozenset(refs), composed=tuple(composed),
+                          properties=frozenset(properties))
@@ -1,14 +1,24 @@
+import weakref
 import networkx as nx
-from typing import Dict, List, Set, Optional
+from collections import OrderedDict
+from typing import Any, Dict, List, Set, Optional, Tuple
 from .operation import Operation
 from .dependency import Dependency
 from .enums import DependencyType
+from .topological_order import IncrementalTopologicalOrder
+from .reduction import redundant_edges
+from .reachability import ReachabilityIndex
+from .compact import CompactGraph
+from .auth_hubs import is_auth_hub
 
 class DependencyGraph:
     """Main dependency graph structure, optimized for memory and DAG enforcement."""
     
-    def __init__(self):
-        self.graph = nx.DiGraph()
+    def __init__(self, incremental_cycle_check: bool = False, sequence_cache_size: int = 1024):
+        # Edges live either in a mutable networkx graph or, after compact(), in a CompactGraph
+        self._nx_graph: Optional[nx.DiGraph] = nx.DiGraph()
+        self._compact: Optional[CompactGraph] = None
+        self._view_ref: Optional["weakref.ref[nx.DiGraph]"] = None
         # Store full operation objects in a registry, not on graph nodes
         self.operations: Dict[str, Operation] = {}
         self.dependencies: List[Dependency] = []
@@ -18,15 +28,85 @@ class DependencyGraph:
         self.consumers: Dict[str, Set[str]] = {}  # param_name -> operation_ids
         self.resource_map: Dict[str, List[str]] = {}  # resource -> operation_ids
         
+        # Adjacency indexes over self.dependencies, kept in sync by every add/remove path
+        self.incoming: Dict[str, List[Dependency]] = {}  # target op_id -> dependencies
+        self.outgoing: Dict[str, List[Dependency]] = {}  # source op_id -> dependencies
+        self.incoming_by_type: Dict[Tuple[str, DependencyType], List[Dependency]] = {}
+        self.outgoing_by_type: Dict[Tuple[str, DependencyType], List[Dependency]] = {}
+        
+        # Optional Pearce-Kelly order: answers cycle checks without a full has_path traversal
+        self.topological_order: Optional[IncrementalTopologicalOrder] = (
+            IncrementalTopologicalOrder() if incremental_cycle_check else None
+        )
+        
+        # Bumped by every mutation; derived structures remember the version they were built for
+        self.version = 0
+        self._reachability: Optional[ReachabilityIndex] = None
+        
+        # LRU cache of operation sequences keyed by (operation_id, version)
+        self.sequence_cache_size = sequence_cache_size
+        self.sequence_cache_hits = 0
+        self.sequence_cache_misses = 0
+        self._sequence_cache: "OrderedDict[Tuple[str, int], List[Operation]]" = OrderedDict()
+    
+    @property
+    def graph(self) -> nx.DiGraph:
+        """
+        The mutable networkx graph. On a compacted graph this thaws the compact
+        storage back into networkx first; read-only callers should prefer
+        networkx_view(). It has no setter: the cycle-check order and dependency
+        indexes are kept in sync with it by the add/remove methods.
+        """
+        if self._nx_graph is None:
+            self._nx_graph = self._compact.to_networkx(self.operations)
+            self._compact = None
+            self._view_ref = None
+        return self._nx_graph
+    
+    @property
+    def is_compact(self) -> bool:
+        return self._compact is not None
+    
+    def compact(self) -> CompactGraph:
+        """
+        Move the edges into integer-indexed CompactGraph storage and drop the
+        networkx graph. The reachability index is built first, so has_path and
+        get_operation_sequence keep working without networkx; any mutation
+        (or access to self.graph) converts back to networkx.
+        """
+        if self._compact is None:
+            self._current_reachability()
+            self._compact = CompactGraph(self._nx_graph, self.operations)
+            self._nx_graph = None
+        return self._compact
+    
+    def networkx_view(self) -> nx.DiGraph:
+        """
+        A networkx graph for read-only consumers (visualizer, analyzer, stats).
+        For a compacted graph it is materialized on demand without thawing, and
+        reused while callers still hold a reference to it; mutations of the
+        view are not reflected in this DependencyGraph.
+        """
+        if self._compact is None:
+            return self._nx_graph
+        view = self._view_ref() if self._view_ref is not None else None
+        if view is None:
+            view = self._compact.to_networkx(self.operations)
+            self._view_ref = weakref.ref(view)
+        return view
+        
     def add_operation(self, operation: Operation):
         """Add an operation node to the graph with a lightweight summary."""
         op_id = operation.operation_id
-        if self.graph.has_node(op_id):
+        if op_id in self.operations:
             return
             
         self.operations[op_id] = operation
         # Store a lightweight summary on the node, not the full object
         self.graph.add_node(op_id, **operation.get_summary())
+        self.version += 1
+        if self.topological_order is not None:
+            self.topological_order.add_node(op_id)
         
         # Update indexes with operation_id instead of full object
         for param in operation.produces:
@@ -50,10 +130,15 @@ class DependencyGraph:
             return False
 
         # Cycle check: an edge u->v creates a cycle if a path v->u already exists.
-        if nx.has_path(self.graph, target_id, source_id):
+        if self.topological_order is not None:
+            if not self.topological_order.insert_edge(
+                    self.graph.succ, self.graph.pred, source_id, target_id):
+                return False
+        elif nx.has_path(self.graph, target_id, source_id):
             return False
 
         self.dependencies.append(dependency)
+        self._index_dependency(dependency)
         # Store a lightweight summary on the edge
         self.graph.add_edge(
             source_id,
@@ -61,35 +146,208 @@ class DependencyGraph:
             weight=1.0 - dependency.confidence,
             **dependency.get_graph_summary()
         )
+        self.version += 1
         return True
     
+    def add_dependencies_bulk(self, dependencies: List[Dependency]
+                              ) -> Tuple[List[Dependency], List[Dependency], Dict[str, int]]:
+        """
+        Add a priority-sorted list of dependencies in one pass.
+        Accept/reject decisions are identical to calling add_dependency_if_acyclic
+        on each dependency in order, but cycle checks run against plain adjacency
+        sets and networkx edge attributes are only created for accepted edges.
+        Returns (accepted, rejected, rejected count per dependency type value).
+        """
+        order = self.topological_order
+        if order is None:
+            # Seed a throwaway order from the current (acyclic) graph
+            order = IncrementalTopologicalOrder()
+            for node in nx.topological_sort(self.graph):
+                order.add_node(node)
+        
+        successors = {node: set(adj) for node, adj in self.graph.succ.items()}
+        predecessors = {node: set(adj) for node, adj in self.graph.pred.items()}
+        
+        accepted: List[Dependency] = []
+        rejected: List[Dependency] = []
+        rejected_by_type: Dict[str, int] = {}
+        for dependency in dependencies:
+            source_id = dependency.source.operation_id
+            target_id = dependency.target.operation_id
+            if (source_id not in successors or target_id not in successors or
+                    not order.insert_edge(successors, predecessors, source_id, target_id)):
+                rejected.append(dependency)
+                type_name = dependency.type.value
+                rejected_by_type[type_name] = rejected_by_type.get(type_name, 0) + 1
+                continue
+            successors[source_id].add(target_id)
+            predecessors[target_id].add(source_id)
+            accepted.append(dependency)
+        
+        # Materialize the accepted edges in a single networkx call
+        self.dependencies.extend(accepted)
+        for dep in accepted:
+            self._index_dependency(dep)
+        self.graph.add_edges_from(
+            (dep.source.operation_id, dep.target.operation_id,
+             dict(weight=1.0 - dep.confidence, **dep.get_graph_summary()))
+            for dep in accepted
+        )
+        if accepted:
+            self.version += 1
+        return accepted, rejected, rejected_by_type
+    
+    def transitive_reduction(self, prune_dependencies: bool = True) -> int:
+        """
+        Remove transitively implied edges in place, keeping node and edge attributes.
+        With prune_dependencies, the Dependency objects behind removed edges are dropped
+        too, so self.dependencies (and its indexes) match the reduced edge set.
+        Returns the number of removed edges.
+        """
+        redundant = redundant_edges(self.graph)
+        self.graph.remove_edges_from(redundant)
+        if redundant:
+            self.version += 1
+        
+        if prune_dependencies and redundant:
+            self.dependencies = [
+                d for d in self.dependencies
+                if self.graph.has_edge(d.source.operation_id, d.target.operation_id)
+            ]
+            self._rebuild_dependency_indexes()
+        return len(redundant)
+    
+    def remove_dependency(self, dependency: Dependency):
+        """Remove a dependency, its index entries and, if no other dependency backs it, its edge."""
+        source_id = dependency.source.operation_id
+        target_id = dependency.target.operation_id
+        
+        self._remove_by_identity(self.dependencies, dependency)
+        self._unindex_dependency(dependency)
+        self.version += 1
+        
+        still_backed = any(d.target.operation_id == target_id 
+                           for d in self.outgoing.get(source_id, []))
+        if not still_backed and self.graph.has_edge(source_id, target_id):
+            self.graph.remove_edge(source_id, target_id)
+    
+    def _index_dependency(self, dependency: Dependency):
+        """Register a dependency in the incoming/outgoing indexes."""
+        source_id = dependency.source.operation_id
+        target_id = dependency.target.operation_id
+        self.incoming.setdefault(target_id, []).append(dependency)
+        self.outgoing.setdefault(source_id, []).append(dependency)
+        self.incoming_by_type.setdefault((target_id, dependency.type), []).append(dependency)
+        self.outgoing_by_type.setdefault((source_id, dependency.type), []).append(dependency)
+    
+    def _rebuild_dependency_indexes(self):
+        """Recreate the incoming/outgoing indexes from self.dependencies."""
+        self.incoming = {}
+        self.outgoing = {}
+        self.incoming_by_type = {}
+        self.outgoing_by_type = {}
+        for dep in self.dependencies:
+            self._index_dependency(dep)
+    
+    def _unindex_dependency(self, dependency: Dependency):
+        """Drop a dependency from the incoming/outgoing indexes."""
+        source_id = dependency.source.operation_id
+        target_id = dependency.target.operation_id
+        for index, key in ((self.incoming, target_id),
+                           (self.outgoing, source_id),
+                           (self.incoming_by_type, (target_id, dependency.type)),
+                           (self.outgoing_by_type, (source_id, dependency.type))):
+            bucket = index.get(key)
+            if bucket is None:
+                continue
+            self._remove_by_identity(bucket, dependency)
+            if not bucket:
+                del index[key]
+    
+    @staticmethod
+    def _remove_by_identity(items: List[Dependency], dependency: Dependency):
+        """Remove one object from a list by identity (dataclass equality compares whole operations)."""
+        for i, item in enumerate(items):
+            if item is dependency:
+                del items[i]
+                return
+    
     def get_dependencies(self, operation: Operation, 
                         dep_type: Optional[DependencyType] = None) -> List[Dependency]:
-        """Get all dependencies for an operation"""
-        deps = [d for d in self.dependencies if d.target.operation_id == operation.operation_id]
+        """Get all dependencies for an operation (incoming edges), in O(degree)"""
+        if dep_type:
+            return list(self.incoming_by_type.get((operation.operation_id, dep_type), []))
+        return list(self.incoming.get(operation.operation_id, []))
+    
+    def get_dependents(self, operation: Operation,
+                       dep_type: Optional[DependencyType] = None) -> List[Dependency]:
+        """Get all dependencies that require this operation (outgoing edges), in O(degree)"""
         if dep_type:
-            deps = [d for d in deps if d.type == dep_type]
-        return deps
+            return list(self.outgoing_by_type.get((operation.operation_id, dep_type), []))
+        return list(self.outgoing.get(operation.operation_id, []))
+    
+    def build_reachability_index(self) -> ReachabilityIndex:
+        """
+        Freeze the current graph into a ReachabilityIndex used by has_path and
+        get_operation_sequence. Any later mutation bumps self.version, which
+        invalidates the index; it is rebuilt lazily on the next query.
+        """
+        self._reachability = ReachabilityIndex(self.graph, self.version)
+        return self._reachability
+    
+    def _current_reachability(self) -> ReachabilityIndex:
+        """Return a reachability index matching the current graph version."""
+        if self._reachability is None or self._reachability.version != self.version:
+            return self.build_reachability_index()
+        return self._reachability
     
     def get_operation_sequence(self, operation: Operation) -> List[Operation]:
-        """Get ordered sequence of operations needed before this one"""
+        """
+        Get ordered sequence of operations needed before this one.
+        Auth hubs are virtual and never part of a sequence; the auth operations
+        behind them are.
+        """
         op_id = operation.operation_id
-        if op_id not in self.graph:
+        if op_id not in self.operations:
             return []
         
-        ancestors = nx.ancestors(self.graph, op_id)
-        subgraph = self.graph.subgraph(ancestors | {op_id})
+        key = (op_id, self.version)
+        sequence = self._sequence_cache.get(key)
+        if sequence is not None:
+            self.sequence_cache_hits += 1
+            self._sequence_cache.move_to_end(key)
+            return list(sequence)
         
-        sequence_ids = list(nx.topological_sort(subgraph))
-        return [self.operations[op_id] for op_id in sequence_ids]
+        self.sequence_cache_misses += 1
+        sequence_ids = self._current_reachability().ancestor_sequence(op_id)
+        sequence = [self.operations[seq_id] for seq_id in sequence_ids
+                    if not is_auth_hub(self.operations[seq_id])]
+        if self.sequence_cache_size > 0:
+            self._sequence_cache[key] = sequence
+            if len(self._sequence_cache) > self.sequence_cache_size:
+                self._sequence_cache.popitem(last=False)
+        return list(sequence)
+    
+    def sequence_cache_info(self) -> Dict[str, Any]:
+        """Hit/miss counters and occupancy of the operation sequence cache."""
+        return {
+            'hits': self.sequence_cache_hits,
+            'misses': self.sequence_cache_misses,
+            'size': len(self._sequence_cache),
+            'max_size': self.sequence_cache_size,
+            'version': self.version
+        }
     
     def detect_cycles(self) -> List[List[str]]:
         """Detect cycles in the dependency graph. Should return an empty list."""
         try:
-            return list(nx.simple_cycles(self.graph))
+            return list(nx.simple_cycles(self.networkx_view()))
         except nx.NetworkXError:
             return []
     
     def has_path(self, source: Operation, target: Operation) -> bool:
-        """Check if there's a path from source to target"""
-        return nx.has_path(self.graph, source.operation_id, target.operation_id)
\ No newline at end of file
+        """
+        Check if there's a path from source to target. Auth hubs are ordinary
+        nodes here: auth -> hub -> protected is a path from auth to protected.
+        """
+        return self._current_reachability().has_path(source.operation_id, target.operation_id)
\ No newline at end of file
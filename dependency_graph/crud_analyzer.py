@@ -1,14 +1,41 @@
-from typing import Dict, List
+from itertools import chain
+from typing import Callable, Dict, FrozenSet, List, Iterator
 from .operation import Operation
-from .dependency import Dependency
+from .dependency import Dependency, DependencyRecord
 from .enums import DependencyType, HTTPMethod
 
+class SignatureIndex:
+    """
+    Operations grouped by path signature (the set of static path segments).
+    related() returns, in list order, the operations whose signature contains a
+    given signature or is contained in it; the answer is cached per signature.
+    """
+    
+    def __init__(self, ops: List[Operation], signature: Callable[[Operation], FrozenSet[str]]):
+        self.ops = ops
+        self.groups: Dict[FrozenSet[str], List[int]] = {}
+        for position, op in enumerate(ops):
+            self.groups.setdefault(signature(op), []).append(position)
+        self._related: Dict[FrozenSet[str], List[Operation]] = {}
+    
+    def related(self, signature: FrozenSet[str]) -> List[Operation]:
+        ops = self._related.get(signature)
+        if ops is None:
+            groups = [positions for other, positions in self.groups.items()
+                      if signature <= other or other <= signature]
+            positions = groups[0] if len(groups) == 1 else sorted(chain.from_iterable(groups))
+            ops = self._related[signature] = [self.ops[position] for position in positions]
+        return ops
+
+
 class CRUDDependencyAnalyzer:
     """Analyze CRUD-based dependencies"""
     
     def __init__(self, operations: List[Operation]):
         self.operations = operations
         self.dependencies: List[Dependency] = []
+        # path -> static segments; see _signature
+        self._signatures: Dict[str, FrozenSet[str]] = {}
     
     def _is_true_create(self, op: Operation) -> bool:
         """
@@ -39,8 +66,11 @@ class CRUDDependencyAnalyzer:
     
     def analyze(self) -> List[Dependency]:
         """Find CRUD dependencies"""
-        dependencies = []
-        
+        self.dependencies = [record.to_dependency() for record in self.iter_dependencies()]
+        return self.dependencies
+    
+    def iter_dependencies(self) -> Iterator[DependencyRecord]:
+        """Yield CRUD dependencies as lightweight records"""
         # Group operations by resource type
         resource_ops: Dict[str, List[Operation]] = {}
         for op in self.operations:
@@ -52,83 +82,80 @@ class CRUDDependencyAnalyzer:
         # For each resource, establish CRUD dependencies
         for resource, ops in resource_ops.items():
             # Separate by HTTP method - only true creates for POST
-            creates = [op for op in ops if self._is_true_create(op)]
-            reads = [op for op in ops if op.method == HTTPMethod.GET]
-            updates = [op for op in ops if op.method in [HTTPMethod.PUT, HTTPMethod.PATCH]]
-            deletes = [op for op in ops if op.method == HTTPMethod.DELETE]
-            
+            creates = []
+            reads = []
+            updates = []
+            deletes = []
             # Also treat non-create POST operations as updates (they modify existing resources)
-            post_updates = [op for op in ops if op.method == HTTPMethod.POST and not self._is_true_create(op)]
+            post_updates = []
+            for op in ops:
+                if op.method == HTTPMethod.POST:
+                    (creates if self._is_true_create(op) else post_updates).append(op)
+                elif op.method == HTTPMethod.GET:
+                    reads.append(op)
+                elif op.method in [HTTPMethod.PUT, HTTPMethod.PATCH]:
+                    updates.append(op)
+                elif op.method == HTTPMethod.DELETE:
+                    deletes.append(op)
             updates.extend(post_updates)
             
+            # Every pair starts from a create or a read
+            if not creates and not (reads and updates):
+                continue
+            
+            # Related pairs come from signature lookups instead of pairwise path tests
+            read_index = SignatureIndex(reads, self._signature)
+            update_index = SignatureIndex(updates, self._signature)
+            delete_index = SignatureIndex(deletes, self._signature)
+            
             # CREATE → READ
             for create in creates:
-                for read in reads:
-                    if self._is_crud_related(create, read):
-                        dep = Dependency(
-                            source=create,
-                            target=read,
-                            type=DependencyType.CRUD,
-                            confidence=0.9,
-                            reason=f"CRUD: Must create {resource} before reading"
-                        )
-                        dependencies.append(dep)
+                for read in read_index.related(self._signature(create)):
+                    yield DependencyRecord(
+                        source=create,
+                        target=read,
+                        type=DependencyType.CRUD,
+                        confidence=0.9,
+                        reason=f"CRUD: Must create {resource} before reading"
+                    )
             
             # CREATE → UPDATE
             for create in creates:
-                for update in updates:
-                    if self._is_crud_related(create, update):
-                        dep = Dependency(
-                            source=create,
-                            target=update,
-                            type=DependencyType.CRUD,
-                            confidence=0.9,
-                            reason=f"CRUD: Must create {resource} before updating"
-                        )
-                        dependencies.append(dep)
+                for update in update_index.related(self._signature(create)):
+                    yield DependencyRecord(
+                        source=create,
+                        target=update,
+                        type=DependencyType.CRUD,
+                        confidence=0.9,
+                        reason=f"CRUD: Must create {resource} before updating"
+                    )
             
             # CREATE → DELETE
             for create in creates:
-                for delete in deletes:
-                    if self._is_crud_related(create, delete):
-                        dep = Dependency(
-                            source=create,
-                            target=delete,
-                            type=DependencyType.CRUD,
-                            confidence=0.9,
-                            reason=f"CRUD: Must create {resource} before deleting"
-                        )
-                        dependencies.append(dep)
+                for delete in delete_index.related(self._signature(create)):
+                    yield DependencyRecord(
+                        source=create,
+                        target=delete,
+                        type=DependencyType.CRUD,
+                        confidence=0.9,
+                        reason=f"CRUD: Must create {resource} before deleting"
+                    )
             
             # READ → UPDATE (optional, less certain)
             for read in reads:
-                for update in updates:
-                    if self._is_crud_related(read, update):
-                        dep = Dependency(
-                            source=read,
-                            target=update,
-                            type=DependencyType.CRUD,
-                            confidence=0.6,
-                            reason=f"CRUD: Often read {resource} before updating"
-                        )
-                        dependencies.append(dep)
-        
-        self.dependencies = dependencies
-        return dependencies
+                for update in update_index.related(self._signature(read)):
+                    yield DependencyRecord(
+                        source=read,
+                        target=update,
+                        type=DependencyType.CRUD,
+                        confidence=0.6,
+                        reason=f"CRUD: Often read {resource} before updating"
+                    )
     
-    def _is_crud_related(self, op1: Operation, op2: Operation) -> bool:
-        """Check if two operations are related in CRUD context"""
-        # Same resource type
-        if op1.resource_type != op2.resource_type:
-            return False
-        
-        # Check path similarity
-        # e.g., POST /users and GET /users/{id}
-        path1_parts = op1.path.split('/')
-        path2_parts = op2.path.split('/')
-        
-        # Match base path
-        base1 = [p for p in path1_parts if not p.startswith('{')]
-        base2 = [p for p in path2_parts if not p.startswith('{')]
-        
-        return base1 == base2 or set(base1).issubset(set(base2)) or set(base2).issubset(set(base1))
\ No newline at end of file
+    def _signature(self, op: Operation) -> FrozenSet[str]:
+        """Static (non-template) segments of an operation's path, computed once per path"""
+        signature = self._signatures.get(op.path)
+        if signature is None:
+            signature = self._signatures[op.path] = frozenset(
+                p for p in op.path.split('/') if not p.startswith('{'))
+        return signature
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional
+from typing import Dict, Any, NamedTuple, Optional
 from .enums import DependencyType
 from .operation import Operation
 
@@ -38,4 +38,30 @@ class Dependency:
         if self.verified is not None:
             summary['verified'] = self.verified
             
-        return summary
\ No newline at end of file
+        return summary
+
+
+class DependencyRecord(NamedTuple):
+    """
+    Lightweight dependency yielded by the analyzers' iter_dependencies().
+    Fields mirror Dependency; the builder folds records into merged Dependency
+    objects without materializing one object per raw emission.
+    """
+    source: Operation
+    target: Operation
+    type: DependencyType
+    reason: str = ""
+    confidence: float = 1.0
+    parameter_mapping: Optional[Dict[str, str]] = None
+    constraint: Optional[Any] = None
+
+    def to_dependency(self) -> Dependency:
+        return Dependency(
+            source=self.source,
+            target=self.target,
+            type=self.type,
+            reason=self.reason,
+            confidence=self.confidence,
+            parameter_mapping=dict(self.parameter_mapping or {}),
+            constraint=self.constraint
+        )
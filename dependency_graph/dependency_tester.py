@@ -4,10 +4,14 @@ import requests
 from typing import Optional, Dict, List
 from dependency_graph import build_dependency_graph_from_openapi
 from .stats import GraphStatistics
+from .refs import DocumentStore
 
 OPENAPI_DIR = os.path.join(os.getcwd(), "openapi_specs")
 os.makedirs(OPENAPI_DIR, exist_ok=True)
 
+# Parsed specs are kept here between runs so unchanged ones are not parsed again
+SPEC_CACHE_DIR = os.path.join(OPENAPI_DIR, ".cache")
+
 # All available local OpenAPI specs with their output directories
 LOCAL_SPECS: Dict[str, Dict[str, str]] = {
     "simple_api": {"path": "simple_api.yaml", "output": "./output_simple_api"},
@@ -44,7 +48,8 @@ def download_openapi_spec(url: str, filename: str) -> Optional[str]:
         print(f"✗ Download failed: {e}")
         return None
 
-def run_builder_for_spec(spec_path: str, dynamic: bool, output_dir: str):
+def run_builder_for_spec(spec_path: str, dynamic: bool, output_dir: str,
+                         documents: Optional[DocumentStore] = None):
     """Run the refactored builder wrapper on given spec."""
     if not os.path.isabs(spec_path):
         spec_path = os.path.join(os.getcwd(), spec_path)
@@ -57,7 +62,8 @@ def run_builder_for_spec(spec_path: str, dynamic: bool, output_dir: str):
             spec_path=spec_path,
             enable_dynamic=dynamic,
             export_results=True,
-            output_dir=output_dir
+            output_dir=output_dir,
+            documents=documents or DocumentStore(cache_dir=SPEC_CACHE_DIR)
         )
         print(f"✓ Build finished. Operations: {len(graph.operations)} Dependencies: {len(graph.dependencies)}")
         # Generate and print detailed statistics / benchmark report
@@ -86,13 +92,15 @@ def run_all_local_specs(dynamic: bool = False):
     print(f"{'='*80}")
     
     results = {"success": [], "failed": []}
+    # One store for the whole run: files shared between specs are parsed once
+    documents = DocumentStore(cache_dir=SPEC_CACHE_DIR)
     
     for i, name in enumerate(available, 1):
         info = LOCAL_SPECS[name]
         print(f"\n[{i}/{len(available)}] Processing: {name}")
         print("-" * 40)
         try:
-            run_builder_for_spec(info["path"], dynamic, info["output"])
+            run_builder_for_spec(info["path"], dynamic, info["output"], documents)
             results["success"].append(name)
         except Exception as e:
             print(f"✗ Failed: {e}")
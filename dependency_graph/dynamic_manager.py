@@ -74,8 +74,7 @@ class DynamicDependencyManager:
             # Remove dependency if it fails too many times
             if dep.failure_count >= self.failure_threshold:
                 print(f"  Removing unreliable dependency: {dep.source.operation_id} -> {dep.target.operation_id}")
-                self.graph.graph.remove_edge(dep.source.operation_id, dep.target.operation_id)
-                self.graph.dependencies.remove(dep)
+                self.graph.remove_dependency(dep)
             else:
                 # Decrease confidence
                 dep.confidence = max(0.1, dep.confidence * 0.9)
@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, IntFlag
 
 class DependencyType(Enum):
     """Types of dependencies between operations"""
@@ -19,4 +19,13 @@ class HTTPMethod(Enum):
     DELETE = "DELETE"
     PATCH = "PATCH"
     HEAD = "HEAD"
-    OPTIONS = "OPTIONS"
\ No newline at end of file
+    OPTIONS = "OPTIONS"
+    TRACE = "TRACE"
+
+class OperationRole(IntFlag):
+    """Workflow roles an operation can play, as detected from its id, path and tags"""
+    NONE = 0
+    AUTH = 1
+    SIGNUP = 2
+    LOGOUT = 4
+    ADMIN = 8
@@ -1,24 +1,30 @@
+import copy
 import yaml
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from .core import DependencyGraph
+from .parser import HTTP_METHODS, OpenAPIParser
 from .parameter import Parameter
 from .operation import Operation
 
 class AnnotationExporter:
     """Export dependency graph back to annotated OpenAPI specification"""
     
-    def __init__(self, graph: DependencyGraph, original_spec: Dict[str, Any]):
+    def __init__(self, graph: DependencyGraph, original_spec: Dict[str, Any],
+                 parser: Optional[OpenAPIParser] = None):
         self.graph = graph
         self.original_spec = original_spec
+        # Parser that loaded original_spec; its schema cache resolves $ref request bodies
+        self.parser = parser
     
     def export_annotated_spec(self, output_path: str):
         """Export OpenAPI spec with NAUTILUS-style annotations"""
-        annotated_spec = self.original_spec.copy()
+        # Deep copy: the loaded spec is shared through the parser's document store
+        annotated_spec = copy.deepcopy(self.original_spec)
         
         # Add annotations to each operation
         for path, path_item in annotated_spec.get('paths', {}).items():
             for method, operation_spec in path_item.items():
-                if method.upper() in ['GET', 'POST', 'PUT', 'DELETE', 'PATCH']:
+                if method.upper() in HTTP_METHODS:
                     operation_id = operation_spec.get('operationId', 
                                                      f"{method}_{path.replace('/', '_')}")
                     
@@ -96,6 +102,13 @@ class AnnotationExporter:
                             )
                             if param_annotation:
                                 prop_spec['x-parameter-annotation'] = param_annotation
+                    elif '$ref' in schema and self.parser is not None:
+                        # Referenced schemas are shared between operations, so the
+                        # annotations go on this operation's media type instead
+                        media_spec['x-parameter-annotation'] = {
+                            prop_name: self._create_parameter_annotation_by_name(prop_name, operation)
+                            for prop_name in self.parser.schema_properties(schema)
+                        }
     
     def _create_parameter_annotation(self, parameter: Parameter, 
                                      operation: Operation) -> Dict[str, Any]:
@@ -0,0 +1,66 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Pattern, Set
+from .constraints import ConstraintCache, FlatSchema, Interval
+
+@dataclass(slots=True)
+class OperationFeatures:
+    """
+    Per-operation lookup tables used by the analyzers, built once at parse time.
+    """
+    response_counts: Dict[str, int] = field(default_factory=dict)  # param -> responses producing it
+    required: Dict[str, Any] = field(default_factory=dict)         # param -> 'required' of first declaration
+    produced_types: Dict[str, str] = field(default_factory=dict)   # param -> declared type in a response
+    consumed_types: Dict[str, str] = field(default_factory=dict)   # param -> declared type in the request
+    patterns: Dict[str, Optional[Pattern]] = field(default_factory=dict)  # param -> compiled 'pattern' (None: re cannot compile it)
+    ranges: Dict[str, Interval] = field(default_factory=dict)      # param -> minimum/maximum interval
+    request_schema: Optional[FlatSchema] = None                    # flattened request body schema
+    produced_schemas: Set[str] = field(default_factory=set)        # schema refs in the responses (canonical)
+
+    @classmethod
+    def from_operation(cls, operation, cache: Optional[ConstraintCache] = None) -> 'OperationFeatures':
+        """Build the tables from a parsed Operation (declared body/response types are not recoverable)."""
+        cache = cache or ConstraintCache()
+        features = cls(response_counts=dict(Counter(
+            param for response in operation.responses.values() for param in response.produces
+        )))
+        for param in operation.parameters:
+            features.add_parameter(param, cache)
+        if operation.request_body:
+            features.add_request_body(operation.request_body, cache)
+        for response in operation.responses.values():
+            features.add_response_schema(response.schema, cache)
+        return features
+
+    def add_parameter(self, param, cache: Optional[ConstraintCache] = None):
+        """Record a request parameter; the first declaration of a name wins."""
+        if param.name not in self.required:
+            self.required[param.name] = param.required
+            # The parser records the type of the resolved schema; hand-built
+            # parameters may only carry it on their own schema
+            declared = param.constraints.get('type')
+            if not declared and isinstance(param.schema, dict):
+                declared = param.schema.get('type')
+            if declared:
+                self.consumed_types[param.name] = declared
+            if cache is not None:
+                constraints = param.constraints
+                if isinstance(constraints.get('pattern'), str):
+                    self.patterns[param.name] = cache.pattern(constraints['pattern'])
+                interval = cache.interval(constraints.get('minimum'), constraints.get('maximum'),
+                                          declared)
+                if interval is not None:
+                    self.ranges[param.name] = interval
+
+    def add_request_body(self, request_body: Dict[str, Any], cache: ConstraintCache,
+                         base: Optional[str] = None):
+        """Flatten the first request body schema (base: document holding the body)."""
+        for media_spec in (request_body.get('content') or {}).values():
+            if isinstance(media_spec, dict) and 'schema' in media_spec:
+                self.request_schema = cache.flatten(media_spec['schema'], base)
+                return
+
+    def add_response_schema(self, schema: Any, cache: ConstraintCache,
+                            base: Optional[str] = None):
+        if schema:
+            self.produced_schemas.update(cache.flatten(schema, base).refs)
@@ -0,0 +1,104 @@
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, FrozenSet, List, Tuple
+
+class ParameterNameMatcher:
+    """
+    Fuzzy parameter-name matcher: two names are variants if their normalized
+    forms belong to the same variation group or have a SequenceMatcher ratio
+    above THRESHOLD.
+
+    Names are normalized once, and verdicts are cached per (producer, consumer)
+    normalized pair, so they are shared across resources. Before running
+    SequenceMatcher, a pair must pass two upper bounds on the ratio: one from
+    the length and one from the shared characters. NameIndex uses the length
+    bound to skip hopeless pairs entirely.
+    """
+
+    THRESHOLD = 0.8
+
+    def __init__(self, variations: Dict[str, List[str]]):
+        # normalized name -> indexes of the variation groups that contain it
+        groups: Dict[str, set] = {}
+        for i, variants in enumerate(variations.values()):
+            for variant in variants:
+                groups.setdefault(self.normalize(variant), set()).add(i)
+        self._groups: Dict[str, FrozenSet[int]] = {k: frozenset(v) for k, v in groups.items()}
+        self._normalized: Dict[str, str] = {}
+        self._char_counts: Dict[str, Counter] = {}
+        self._verdicts: Dict[Tuple[str, str], bool] = {}
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        return name.lower().replace('_', '').replace('-', '')
+
+    def normalized(self, name: str) -> str:
+        norm = self._normalized.get(name)
+        if norm is None:
+            norm = self._normalized[name] = self.normalize(name)
+        return norm
+
+    def groups(self, norm: str) -> FrozenSet[int]:
+        return self._groups.get(norm, frozenset())
+
+    @classmethod
+    def length_compatible(cls, len1: int, len2: int) -> bool:
+        """False if no pair of names with these lengths can exceed THRESHOLD."""
+        total = len1 + len2
+        return not total or 2.0 * min(len1, len2) / total > cls.THRESHOLD
+
+    def is_variant(self, name1: str, name2: str) -> bool:
+        """Same verdict as the group check followed by SequenceMatcher(None, n1, n2).ratio() > 0.8."""
+        key = (self.normalized(name1), self.normalized(name2))
+        verdict = self._verdicts.get(key)
+        if verdict is None:
+            verdict = self._verdicts[key] = self._compare(*key)
+        return verdict
+
+    def _compare(self, p1: str, p2: str) -> bool:
+        if self.groups(p1) & self.groups(p2):
+            return True
+        if not self.length_compatible(len(p1), len(p2)):
+            return False
+        # Matching characters are bounded by the shared character multiset (difflib's quick_ratio)
+        total = len(p1) + len(p2)
+        if total:
+            shared = sum((self._counts(p1) & self._counts(p2)).values())
+            if not 2.0 * shared / total > self.THRESHOLD:
+                return False
+        return SequenceMatcher(None, p1, p2).ratio() > self.THRESHOLD
+
+    def _counts(self, norm: str) -> Counter:
+        counts = self._char_counts.get(norm)
+        if counts is None:
+            counts = self._char_counts[norm] = Counter(norm)
+        return counts
+
+
+class NameIndex:
+    """
+    Positions of a list of names, indexed by normalized length and variation group.
+    candidates() returns, in ascending order, every position that can be a variant
+    of a given name.
+    """
+
+    def __init__(self, matcher: ParameterNameMatcher, names: List[str]):
+        self.matcher = matcher
+        self.by_length: Dict[int, List[int]] = {}
+        self.by_group: Dict[int, List[int]] = {}
+        for position, name in enumerate(names):
+            norm = matcher.normalized(name)
+            self.by_length.setdefault(len(norm), []).append(position)
+            for group in matcher.groups(norm):
+                self.by_group.setdefault(group, []).append(position)
+
+    def candidates(self, name: str) -> List[int]:
+        norm = self.matcher.normalized(name)
+        length = len(norm)
+        positions = set()
+        for other_length, bucket in self.by_length.items():
+            if self.matcher.length_compatible(length, other_length):
+                positions.update(bucket)
+        for group in self.matcher.groups(norm):
+            positions.update(self.by_group.get(group, ()))
+        return sorted(positions)
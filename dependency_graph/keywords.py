@@ -0,0 +1,54 @@
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+from .enums import OperationRole
+
+class KeywordClassifier:
+    """
+    Map text to the OperationRole flags whose keywords occur in it as substrings,
+    in one regex scan for all keyword families.
+
+    The pattern is a lookahead alternation, so it tests every start position and
+    overlapping keywords are all found. At each position it reports the longest
+    keyword that starts there. That keyword's flags include those of every
+    keyword that is a prefix of it, so shorter keywords starting at the same
+    position are not lost.
+    """
+
+    def __init__(self, families: Dict[OperationRole, List[str]]):
+        self.families = {role: list(keywords) for role, keywords in families.items()}
+        flags: Dict[str, OperationRole] = {}
+        for role, keywords in self.families.items():
+            for keyword in keywords:
+                flags[keyword] = flags.get(keyword, OperationRole.NONE) | role
+        # Flags of a keyword include those of its prefixes (see class docstring)
+        self.flags: Dict[str, int] = {}
+        for keyword in flags:
+            mask = OperationRole.NONE
+            for other, role in flags.items():
+                if keyword.startswith(other):
+                    mask |= role
+            self.flags[keyword] = int(mask)
+        ordered = sorted(self.flags, key=len, reverse=True)
+        self.pattern = re.compile('(?=(' + '|'.join(map(re.escape, ordered)) + '))') if ordered else None
+
+    def classify(self, texts: Iterable[str]) -> OperationRole:
+        """Roles whose keywords occur in any of the texts (which are not lowercased here)"""
+        if self.pattern is None:
+            return OperationRole.NONE
+        # Keywords never span two texts: '\0' does not occur in a keyword or a path
+        text = '\0'.join(texts)
+        roles = 0
+        for match in self.pattern.finditer(text):
+            roles |= self.flags[match.group(1)]
+        return OperationRole(roles)
+
+    def classify_operation(self, op) -> OperationRole:
+        """Roles of an operation from its lowercased id, path and tags"""
+        return self.classify([op.operation_id.lower(), op.path.lower()] + [tag.lower() for tag in op.tags])
+
+
+@lru_cache(maxsize=None)
+def keyword_classifier(families: Tuple[Tuple[OperationRole, Tuple[str, ...]], ...]) -> KeywordClassifier:
+    """Shared compiled classifier per keyword configuration"""
+    return KeywordClassifier({role: list(keywords) for role, keywords in families})
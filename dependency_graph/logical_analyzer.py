@@ -1,7 +1,9 @@
-from typing import Dict, List
+from typing import Dict, List, Iterator, Optional, Tuple
 from .operation import Operation
-from .dependency import Dependency
-from .enums import DependencyType, HTTPMethod
+from .dependency import Dependency, DependencyRecord
+from .enums import DependencyType, HTTPMethod, OperationRole
+from .keywords import keyword_classifier
+from .auth_hubs import HEURISTIC_KEY, make_auth_hub, security_key
 
 class LogicalDependencyAnalyzer:
     """Analyze logical/business dependencies"""
@@ -12,34 +14,52 @@ class LogicalDependencyAnalyzer:
     LOGOUT_KEYWORDS = ['logout', 'signout']
     ADMIN_KEYWORDS = ['admin', 'administrator']
     
-    def __init__(self, operations: List[Operation]):
+    def __init__(self, operations: List[Operation],
+                 keywords: Optional[Dict[OperationRole, List[str]]] = None,
+                 auth_hubs: bool = False):
         self.operations = operations
         self.dependencies: List[Dependency] = []
+        # Route authentication through one virtual hub per security group (see auth_hubs.py)
+        self.auth_hubs = auth_hubs
+        # Keyword families per role; defaults to the *_KEYWORDS lists above
+        families = keywords or {
+            OperationRole.AUTH: self.AUTH_KEYWORDS,
+            OperationRole.SIGNUP: self.SIGNUP_KEYWORDS,
+            OperationRole.LOGOUT: self.LOGOUT_KEYWORDS,
+            OperationRole.ADMIN: self.ADMIN_KEYWORDS,
+        }
+        self.classifier = keyword_classifier(
+            tuple((role, tuple(words)) for role, words in families.items()))
+        # Role flags per operation (aligned with self.operations), set by classify_operations
+        self.roles: List[OperationRole] = []
     
     def analyze(self) -> List[Dependency]:
         """Find logical dependencies"""
-        dependencies = []
-        
-        # Identify special operations
-        auth_ops = self._find_operations_by_keywords(self.AUTH_KEYWORDS)
-        signup_ops = self._find_operations_by_keywords(self.SIGNUP_KEYWORDS)
-        logout_ops = self._find_operations_by_keywords(self.LOGOUT_KEYWORDS)
-        admin_ops = self._find_operations_by_keywords(self.ADMIN_KEYWORDS)
+        self.dependencies = [record.to_dependency() for record in self.iter_dependencies()]
+        return self.dependencies
+    
+    def iter_dependencies(self) -> Iterator[DependencyRecord]:
+        """Yield logical dependencies as lightweight records"""
+        # Identify special operations (one classifier scan per operation)
+        self.classify_operations()
+        auth_ops = self._operations_with_role(OperationRole.AUTH)
+        signup_ops = self._operations_with_role(OperationRole.SIGNUP)
+        logout_ops = self._operations_with_role(OperationRole.LOGOUT)
+        admin_ops = self._operations_with_role(OperationRole.ADMIN)
         
         # Authentication dependencies
-        dependencies.extend(self._analyze_authentication_deps(auth_ops))
+        yield from self._analyze_authentication_deps(auth_ops)
         
         # Signup → Login dependency
         for signup in signup_ops:
             for login in auth_ops:
-                dep = Dependency(
+                yield DependencyRecord(
                     source=signup,
                     target=login,
                     type=DependencyType.WORKFLOW,
                     confidence=0.8,
                     reason="Must signup before login"
                 )
-                dependencies.append(dep)
         
         # Logout is terminal operation
         for logout in logout_ops:
@@ -50,95 +70,106 @@ class LogicalDependencyAnalyzer:
         # Admin operations require authentication
         for admin_op in admin_ops:
             for auth_op in auth_ops:
-                dep = Dependency(
+                yield DependencyRecord(
                     source=auth_op,
                     target=admin_op,
                     type=DependencyType.AUTHORIZATION,
                     confidence=0.9,
                     reason="Admin operations require authentication"
                 )
-                dependencies.append(dep)
         
         # Security scheme analysis
-        dependencies.extend(self._analyze_security_schemes())
-        
-        self.dependencies = dependencies
-        return dependencies
+        yield from self._analyze_security_schemes(auth_ops)
     
-    def _find_operations_by_keywords(self, keywords: List[str]) -> List[Operation]:
-        """Find operations matching keywords"""
-        matching_ops = []
-        
-        for op in self.operations:
-            # Check operation ID
-            op_id_lower = op.operation_id.lower()
-            if any(kw in op_id_lower for kw in keywords):
-                matching_ops.append(op)
-                continue
-            
-            # Check path
-            path_lower = op.path.lower()
-            if any(kw in path_lower for kw in keywords):
-                matching_ops.append(op)
-                continue
-            
-            # Check tags
-            tags_lower = [tag.lower() for tag in op.tags]
-            if any(any(kw in tag for kw in keywords) for tag in tags_lower):
-                matching_ops.append(op)
-        
-        return matching_ops
+    def classify_operations(self) -> List[OperationRole]:
+        """Role flags of every operation, from its id, path and tags"""
+        self.roles = [self.classifier.classify_operation(op) for op in self.operations]
+        return self.roles
     
-    def _analyze_authentication_deps(self, auth_ops: List[Operation]) -> List[Dependency]:
+    def _operations_with_role(self, role: OperationRole) -> List[Operation]:
+        """Operations carrying a role, in operation order"""
+        return [op for op, roles in zip(self.operations, self.roles) if roles & role]
+    
+    def _analyze_authentication_deps(self, auth_ops: List[Operation]) -> Iterator[DependencyRecord]:
         """Create authentication dependencies for protected operations"""
-        dependencies = []
-        
-        for op in self.operations:
+        if self.auth_hubs:
+            # Emitted per security group by _analyze_security_schemes
+            return
+        for op, roles in zip(self.operations, self.roles or self.classify_operations()):
             # Skip auth operations themselves
-            if op in auth_ops:
+            if roles & OperationRole.AUTH:
                 continue
             
             # Check if operation has security requirements
             if op.security:
                 for auth_op in auth_ops:
-                    dep = Dependency(
+                    yield DependencyRecord(
                         source=auth_op,
                         target=op,
                         type=DependencyType.AUTHENTICATION,
                         confidence=0.95,
                         reason=f"{op.operation_id} requires authentication"
                     )
-                    dependencies.append(dep)
             
             # Heuristic: operations with path parameters often need auth
             elif op.path_params and op.method != HTTPMethod.GET:
                 for auth_op in auth_ops:
-                    dep = Dependency(
+                    yield DependencyRecord(
                         source=auth_op,
                         target=op,
                         type=DependencyType.AUTHENTICATION,
                         confidence=0.7,
                         reason=f"{op.operation_id} likely requires authentication (heuristic)"
                     )
-                    dependencies.append(dep)
-        
-        return dependencies
     
-    def _analyze_security_schemes(self) -> List[Dependency]:
+    def _analyze_security_schemes(self, auth_ops: List[Operation] = ()) -> Iterator[DependencyRecord]:
         """Analyze dependencies based on security schemes"""
-        dependencies = []
-        
-        # Group operations by security requirements
-        security_groups: Dict[str, List[Operation]] = {}
+        if not self.auth_hubs or not auth_ops:
+            # Operations with same security requirements may have dependencies
+            # This is domain-specific and can be extended
+            return
+        yield from self._analyze_auth_hubs(auth_ops, self._security_groups())
+    
+    def _security_groups(self) -> Dict[Tuple[str, ...], List[Operation]]:
+        """
+        Group operations that need authentication by security requirements.
+        Unsecured operations caught by the path-parameter heuristic form the HEURISTIC_KEY group.
+        """
+        security_groups: Dict[Tuple[str, ...], List[Operation]] = {}
         
-        for op in self.operations:
+        for op, roles in zip(self.operations, self.roles or self.classify_operations()):
+            # Auth operations do not depend on themselves
+            if roles & OperationRole.AUTH:
+                continue
             if op.security:
-                security_key = str(sorted([list(s.keys())[0] for s in op.security]))
-                if security_key not in security_groups:
-                    security_groups[security_key] = []
-                security_groups[security_key].append(op)
-        
-        # Operations with same security requirements may have dependencies
-        # This is domain-specific and can be extended
+                security_groups.setdefault(security_key(op), []).append(op)
+            elif op.path_params and op.method != HTTPMethod.GET:
+                security_groups.setdefault(HEURISTIC_KEY, []).append(op)
         
-        return dependencies
\ No newline at end of file
+        return security_groups
+    
+    def _analyze_auth_hubs(self, auth_ops: List[Operation],
+                           security_groups: Dict[Tuple[str, ...], List[Operation]]) -> Iterator[DependencyRecord]:
+        """auth -> hub and hub -> protected edges: O(auth + protected) per security group"""
+        for key, protected_ops in security_groups.items():
+            hub = make_auth_hub(key)
+            heuristic = key == HEURISTIC_KEY
+            
+            for auth_op in auth_ops:
+                yield DependencyRecord(
+                    source=auth_op,
+                    target=hub,
+                    type=DependencyType.AUTHENTICATION,
+                    confidence=0.95,
+                    reason=f"{auth_op.operation_id} authenticates {hub.operation_id}"
+                )
+            
+            for op in protected_ops:
+                yield DependencyRecord(
+                    source=hub,
+                    target=op,
+                    type=DependencyType.AUTHENTICATION,
+                    confidence=0.7 if heuristic else 0.95,
+                    reason=(f"{op.operation_id} likely requires authentication (heuristic)" if heuristic
+                            else f"{op.operation_id} requires authentication")
+                )
@@ -0,0 +1,177 @@
+from typing import Any, Callable, Dict, Iterable, Mapping, Set, Tuple, Union
+import numpy as np
+from .dependency import Dependency, DependencyRecord
+
+DependencyLike = Union[Dependency, DependencyRecord]
+
+class _MergedPair:
+    """Running merge state for a (source, target) pair seen more than once."""
+    __slots__ = ('base', 'base_key', 'confidence', 'reasons', 'mapping')
+
+    def __init__(self, first: DependencyLike, first_key: Tuple):
+        self.base = first
+        self.base_key = first_key
+        self.confidence = first.confidence
+        self.reasons: Set[str] = set()
+        # mapping name -> (sort key of the value, value, (sort key, arrival) of its last
+        # occurrence, position there)
+        self.mapping: Dict[str, Tuple[Tuple, Any, Tuple, int]] = {}
+        # The first dependency's arrival index is not kept; any value below later ones works
+        self.fold(first, first_key, -1)
+
+    def fold(self, dep: DependencyLike, key: Tuple, arrival: int):
+        """Fold a dependency that arrived after everything folded so far."""
+        # Ties go to the earlier arrival for the base/value, and to the later one for key order
+        if key < self.base_key:
+            self.base, self.base_key = dep, key
+        if dep.confidence > self.confidence:
+            self.confidence = dep.confidence
+        if dep.reason:
+            self.reasons.add(dep.reason)
+        if dep.parameter_mapping:
+            mapping = self.mapping
+            for position, (name, value) in enumerate(dep.parameter_mapping.items()):
+                entry = mapping.get(name)
+                if entry is None:
+                    mapping[name] = (key, value, (key, arrival), position)
+                    continue
+                value_key, old_value, order_rank, order_position = entry
+                if key < value_key:
+                    value_key, old_value = key, value
+                if key >= order_rank[0]:
+                    order_rank, order_position = (key, arrival), position
+                mapping[name] = (value_key, old_value, order_rank, order_position)
+
+    @property
+    def type(self):
+        return self.base.type
+
+    def to_dependency(self) -> Dependency:
+        base = self.base
+        # dict.update over the reversed sort order inserts names by descending sort key
+        # of their last occurrence, keeping each dependency's own name order
+        names = sorted(self.mapping, key=lambda n: (self.mapping[n][2], -self.mapping[n][3]),
+                       reverse=True)
+        return Dependency(
+            source=base.source,
+            target=base.target,
+            type=base.type,
+            reason="; ".join(sorted(self.reasons)),
+            confidence=self.confidence,
+            parameter_mapping={name: self.mapping[name][1] for name in names},
+            constraint=base.constraint,
+            verified=getattr(base, 'verified', None)
+        )
+
+
+class DependencyMerger:
+    """
+    Fold a stream of dependencies into one merged Dependency per (source, target).
+
+    The result matches the old batch merge. That merge stable-sorted each pair's
+    dependencies by sort_key. The first one gave the type and constraint, and the
+    confidence was the maximum. Parameter mappings were combined with dict.update
+    over the reversed order, and reasons were sorted and joined with "; ".
+    A pair seen once keeps just its dependency. Only repeated pairs carry merge
+    state, so memory grows with unique pairs rather than raw emissions.
+    """
+
+    def __init__(self, sort_key: Callable[[DependencyLike], Tuple]):
+        self.sort_key = sort_key
+        self.pairs: Dict[Tuple[str, str], Union[DependencyLike, _MergedPair]] = {}
+        self.count = 0
+
+    def add(self, dep: DependencyLike):
+        self.count += 1
+        key = (dep.source.operation_id, dep.target.operation_id)
+        current = self.pairs.get(key)
+        if current is None:
+            self.pairs[key] = dep
+            return
+        if not isinstance(current, _MergedPair):
+            current = self.pairs[key] = _MergedPair(current, self.sort_key(current))
+        current.fold(dep, self.sort_key(dep), self.count)
+
+    def add_all(self, dependencies: Iterable[DependencyLike]) -> int:
+        """Fold every dependency from an iterable; returns how many were consumed."""
+        start = self.count
+        for dep in dependencies:
+            self.add(dep)
+        return self.count - start
+
+    def drain(self) -> Dict[Tuple[str, str], Union[DependencyLike, _MergedPair]]:
+        """
+        Take the per-pair merge state, in first-seen order, without building Dependencies.
+        Every entry has .type and .confidence; finalize() turns one into its Dependency.
+        """
+        pairs = self.pairs
+        self.pairs = {}
+        return pairs
+
+    @staticmethod
+    def finalize(state: Union[DependencyLike, _MergedPair]) -> Dependency:
+        if isinstance(state, (_MergedPair, DependencyRecord)):
+            return state.to_dependency()
+        return state
+
+
+class DependencyColumns:
+    """
+    Columnar view of merged dependencies for conflict resolution: one row per
+    (source, target) pair with int32 source/target operation indexes, the type
+    priority and the confidence, in first-seen pair order.
+
+    Resolution works on these arrays with sorts and group boundaries only, so no
+    Dependency is built for a pair that loses (see DependencyMerger.finalize).
+    """
+
+    def __init__(self, pairs: Mapping[Tuple[str, str], Any], type_priority: Mapping[Any, int],
+                 default_priority: int = 99):
+        index: Dict[str, int] = {}
+        count = len(pairs)
+        self.source = np.empty(count, dtype=np.int32)
+        self.target = np.empty(count, dtype=np.int32)
+        self.priority = np.empty(count, dtype=np.int16)
+        self.confidence = np.empty(count, dtype=np.float64)
+        for row, ((src, tgt), state) in enumerate(pairs.items()):
+            self.source[row] = index.setdefault(src, len(index))
+            self.target[row] = index.setdefault(tgt, len(index))
+            self.priority[row] = type_priority.get(state.type, default_priority)
+            self.confidence[row] = state.confidence
+        self.node_count = len(index)
+
+    def __len__(self) -> int:
+        return len(self.source)
+
+    def resolve_bidirectional(self) -> np.ndarray:
+        """
+        Rows that survive A→B vs B→A conflicts, in first-seen order.
+
+        Of two opposite pairs the one with the lower type priority wins; on equal
+        priority the earlier pair wins unless the later one is strictly more
+        confident. The survivor takes the earlier pair's position.
+        """
+        count = len(self)
+        if not count:
+            return np.empty(0, dtype=np.intp)
+        # Both directions of a pair share the key (min, max)
+        low = np.minimum(self.source, self.target).astype(np.int64)
+        high = np.maximum(self.source, self.target).astype(np.int64)
+        order = np.argsort(low * self.node_count + high, kind='stable')
+        sorted_low, sorted_high = low[order], high[order]
+        starts = np.flatnonzero(np.concatenate((
+            [True], (sorted_low[1:] != sorted_low[:-1]) | (sorted_high[1:] != sorted_high[:-1]))))
+        # A group holds at most the two directions; stable sorting puts the earlier one first
+        first = order[starts]
+        sizes = np.diff(np.append(starts, count))
+        second = np.where(sizes == 2, order[np.minimum(starts + 1, count - 1)], first)
+
+        priority, confidence = self.priority, self.confidence
+        later_wins = (priority[second] < priority[first]) | (
+            (priority[second] == priority[first]) & (confidence[first] < confidence[second]))
+        winners = np.where(later_wins, second, first)
+        return winners[np.argsort(first, kind='stable')]
+
+    def priority_order(self, rows: np.ndarray) -> np.ndarray:
+        """rows stably sorted by (type priority, -confidence)."""
+        return rows[np.lexsort((-self.confidence[rows], self.priority[rows]))]
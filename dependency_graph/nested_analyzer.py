@@ -1,19 +1,26 @@
-from typing import Dict, Any, List
+import re
+from typing import Dict, Any, List, Iterator
 from .operation import Operation
-from .dependency import Dependency
+from .dependency import Dependency, DependencyRecord
 from .enums import DependencyType, HTTPMethod
 
 class NestedResourceAnalyzer:
     """Analyze nested resource dependencies"""
     
+    # Path template expressions; their names do not matter for nesting
+    TEMPLATE = re.compile(r'\{[^{}]*\}')
+    
     def __init__(self, operations: List[Operation]):
         self.operations = operations
         self.dependencies: List[Dependency] = []
     
     def analyze(self) -> List[Dependency]:
         """Find nested resource dependencies"""
-        dependencies = []
-        
+        self.dependencies = [record.to_dependency() for record in self.iter_dependencies()]
+        return self.dependencies
+    
+    def iter_dependencies(self) -> Iterator[DependencyRecord]:
+        """Yield nested resource dependencies as lightweight records"""
         # Build path hierarchy
         path_tree = self._build_path_tree()
         
@@ -22,52 +29,58 @@ class NestedResourceAnalyzer:
             parent_ops = self._find_parent_operations(op, path_tree)
             
             for parent_op in parent_ops:
-                dep = Dependency(
+                yield DependencyRecord(
                     source=parent_op,
                     target=op,
                     type=DependencyType.NESTED_RESOURCE,
                     confidence=0.85,
                     reason=f"{op.path} is nested under {parent_op.path}"
                 )
-                dependencies.append(dep)
-        
-        self.dependencies = dependencies
-        return dependencies
+    
+    @classmethod
+    def _path_key(cls, path: str) -> List[str]:
+        """Trie key of a path: its non-empty segments with template names erased"""
+        return [cls.TEMPLATE.sub('{}', part) for part in path.split('/') if part]
     
     def _build_path_tree(self) -> Dict[str, Any]:
-        """Build hierarchical tree of paths"""
+        """
+        Build hierarchical tree of paths. Equivalent templates such as {owner} and
+        {org} share a node, and each node indexes its POST operations.
+        """
         tree = {}
         
         for op in self.operations:
-            parts = [p for p in op.path.split('/') if p]
+            parts = self._path_key(op.path)
             current = tree
             
             for part in parts:
                 if part not in current:
-                    current[part] = {'operations': [], 'children': {}}
+                    current[part] = {'operations': [], 'posts': [], 'children': {}}
                 leaf_node = current[part]
                 current = current[part]['children']
             
             # Store operation at leaf
             if parts:
                 leaf_node['operations'].append(op)
+                if op.method == HTTPMethod.POST:
+                    leaf_node['posts'].append(op)
         
         return tree
     
     def _find_parent_operations(self, operation: Operation, 
                                 path_tree: Dict[str, Any]) -> List[Operation]:
-        """Find parent operations in the path hierarchy"""
+        """Find parent operations in the path hierarchy (one trie step per level)"""
         parents = []
         
-        path_parts = [p for p in operation.path.split('/') if p]
+        path_parts = self._path_key(operation.path)
         
-        # Check each level up the hierarchy
-        for i in range(len(path_parts) - 1):
-            parent_path = '/' + '/'.join(path_parts[:i+1])
-            
-            # Find operations that match this parent path
-            for op in self.operations:
-                if op.path == parent_path and op.method == HTTPMethod.POST:
-                    parents.append(op)
+        # Check each level up the hierarchy: POST operations on every proper prefix
+        current = path_tree
+        for part in path_parts[:-1]:
+            node = current.get(part)
+            if node is None:
+                break
+            parents.extend(node['posts'])
+            current = node['children']
         
-        return parents
\ No newline at end of file
+        return parents
@@ -3,6 +3,7 @@ from typing import List, Dict, Any, Optional, Set
 from .enums import HTTPMethod
 from .parameter import Parameter
 from .response import Response
+from .features import OperationFeatures
 
 @dataclass(slots=True)
 class Operation:
@@ -20,6 +21,7 @@ class Operation:
     path_params: Set[str] = field(default_factory=set)
     resource_type: Optional[str] = None
     annotations: Dict[str, Any] = field(default_factory=dict)
+    features: Optional[OperationFeatures] = None  # confidence lookup tables, set by the parser
 
     def __hash__(self):
         return hash(self.operation_id)
@@ -0,0 +1,100 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .operation import Operation
+from .dependency import DependencyRecord
+
+# Operations seen by a worker process, inherited from the parent when it forks
+_worker_operations: Optional[List[Operation]] = None
+
+# (source index, target index, type, reason, confidence, parameter_mapping, constraint)
+DependencyRow = Tuple[int, int, Any, str, float, Optional[Dict[str, str]], Any]
+
+def _run_analyzer(analyzer_cls: Callable) -> Tuple[List[DependencyRow], List[Operation],
+                                                   Dict[int, Dict[str, Any]], float, int]:
+    """
+    Run one analyzer over the worker's operations.
+    Dependencies come back as rows that reference operations by list index.
+    Operations the analyzer created itself (e.g. auth hubs) are returned
+    separately and indexed after the input list. Annotation writes
+    (e.g. term_operations) come back as {index: changed keys}, followed by the
+    wall time and the analyzer's suppressed_edges count.
+    """
+    operations = _worker_operations
+    before = [dict(op.annotations) for op in operations]
+
+    start = time.perf_counter()
+    position = {id(op): i for i, op in enumerate(operations)}
+    created: List[Operation] = []
+    
+    def index(op: Operation) -> int:
+        i = position.get(id(op))
+        if i is None:
+            i = position[id(op)] = len(operations) + len(created)
+            created.append(op)
+        return i
+    
+    analyzer = analyzer_cls(operations)
+    rows = [
+        (index(d.source), index(d.target), d.type, d.reason,
+         d.confidence, d.parameter_mapping, d.constraint)
+        for d in analyzer.iter_dependencies()
+    ]
+    elapsed = time.perf_counter() - start
+    annotations = {}
+    for i, op in enumerate(operations):
+        changed = {k: v for k, v in op.annotations.items()
+                   if k not in before[i] or before[i][k] != v}
+        if changed:
+            annotations[i] = changed
+    return rows, created, annotations, elapsed, getattr(analyzer, 'suppressed_edges', 0)
+
+def run_analyzers_parallel(operations: List[Operation], analyzer_classes: List[Callable],
+                           max_workers: Optional[int] = None) -> List[Tuple[List[DependencyRecord], float, int]]:
+    """
+    Run analyzers concurrently in a process pool.
+    Returns (records, wall seconds, suppressed edges) per analyzer in the order given, with
+    records bound to the caller's Operation objects and annotation writes
+    applied in that same order, so merging is identical to running them serially.
+
+    Workers are forked so they share the parent's operations (nothing is pickled
+    on the way in) and its string hash secret: set iteration inside the analyzers,
+    and thus dependency order, then matches a serial run. Unpickled sets do not
+    keep their iteration order, so where fork is unavailable the analyzers run
+    in-process instead.
+    """
+    global _worker_operations
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        serial = []
+        for cls in analyzer_classes:
+            start = time.perf_counter()
+            analyzer = cls(operations)
+            records = list(analyzer.iter_dependencies())
+            serial.append((records, time.perf_counter() - start,
+                           getattr(analyzer, 'suppressed_edges', 0)))
+        return serial
+
+    workers = max_workers or min(len(analyzer_classes), os.cpu_count() or 1)
+    _worker_operations = operations
+    try:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context('fork')) as pool:
+            futures = [pool.submit(_run_analyzer, cls) for cls in analyzer_classes]
+            results = [future.result() for future in futures]
+    finally:
+        _worker_operations = None
+
+    merged: List[Tuple[List[DependencyRecord], float, int]] = []
+    for rows, created, annotations, elapsed, suppressed in results:
+        for i, changed in annotations.items():
+            operations[i].annotations.update(changed)
+        pool = operations + created if created else operations
+        records = [
+            DependencyRecord(pool[s], pool[t], dep_type, reason, confidence,
+                             mapping, constraint)
+            for s, t, dep_type, reason, confidence, mapping, constraint in rows
+        ]
+        merged.append((records, elapsed, suppressed))
+    return merged
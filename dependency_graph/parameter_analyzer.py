@@ -1,7 +1,10 @@
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Iterator
 from .operation import Operation
-from .dependency import Dependency
+from .dependency import Dependency, DependencyRecord
 from .enums import DependencyType, HTTPMethod
+from .features import OperationFeatures
+from .constraints import ConstraintCache
+from .fuzzy_matching import ParameterNameMatcher, NameIndex
 
 class ParameterDependencyAnalyzer:
     """Analyze parameter-wise dependencies (producer-consumer)"""
@@ -12,14 +15,31 @@ class ParameterDependencyAnalyzer:
                       'updated_at', 'timestamp', 'count', 'total', 'data', 'result',
                       'message', 'code', 'error', 'success', 'page', 'limit', 'offset'}
     
+    # JSON schema types that carry interchangeable values
+    TYPE_FAMILIES = {'integer': 'number', 'number': 'number'}
+    
+    # Common parameter name variations used by fuzzy matching
+    NAME_VARIATIONS = {
+        'id': ['ID', 'Id', '_id', 'identifier'],
+        'user_id': ['userId', 'user_ID', 'userID', 'uid'],
+        'username': ['user_name', 'userName', 'login', 'user'],
+        'pet_id': ['petId', 'pet_ID', 'petID'],
+        'order_id': ['orderId', 'order_ID', 'orderID'],
+    }
+    
     def __init__(self, operations: List[Operation]):
         self.operations = operations
         self.dependencies: List[Dependency] = []
+        # Used only for operations the parser did not build features for
+        self.constraint_cache = ConstraintCache()
     
     def analyze(self) -> List[Dependency]:
         """Find all parameter-wise dependencies"""
-        dependencies = []
-        
+        self.dependencies = [record.to_dependency() for record in self.iter_dependencies()]
+        return self.dependencies
+    
+    def iter_dependencies(self) -> Iterator[DependencyRecord]:
+        """Yield parameter-wise dependencies as lightweight records"""
         # Build producer-consumer maps with resource context
         # Key: (param_name, resource_type or None)
         producers: Dict[Tuple[str, str], List[Operation]] = {}
@@ -40,16 +60,21 @@ class ParameterDependencyAnalyzer:
                     consumers[key] = []
                 consumers[key].append(op)
         
+        # Hash-join consumers on parameter name (buckets keep the consumers' insertion order)
+        consumers_by_param: Dict[str, List[Tuple[str, List[Operation]]]] = {}
+        for (cons_param, cons_resource), cons_ops in consumers.items():
+            consumers_by_param.setdefault(cons_param, []).append((cons_resource, cons_ops))
+
         # Match producers with consumers - ONLY within same resource or related resources
         for (param_name, prod_resource), prod_ops in producers.items():
-            for (cons_param, cons_resource), cons_ops in consumers.items():
-                if param_name != cons_param:
-                    continue
-                
-                # Check if these resources should be linked
-                if not self._should_link_resources(param_name, prod_resource, cons_resource):
-                    continue
-                    
+            if self._links_across_resources(param_name):
+                matches = consumers_by_param.get(param_name, ())
+            else:
+                # A parameter that may not link resources only links within its own resource
+                same_resource = consumers.get((param_name, prod_resource))
+                matches = ((prod_resource, same_resource),) if same_resource else ()
+            
+            for cons_resource, cons_ops in matches:
                 for producer in prod_ops:
                     for consumer in cons_ops:
                         if producer == consumer:
@@ -60,7 +85,7 @@ class ParameterDependencyAnalyzer:
                         if self._is_semantic_backward(producer, consumer):
                             continue
                             
-                        dep = Dependency(
+                        yield DependencyRecord(
                             source=producer,
                             target=consumer,
                             type=DependencyType.PARAMETER_DATA,
@@ -69,22 +94,12 @@ class ParameterDependencyAnalyzer:
                             reason=f"Parameter '{param_name}' produced by {producer.operation_id} "
                                    f"and consumed by {consumer.operation_id}"
                         )
-                        dependencies.append(dep)
         
         # Fuzzy matching - but with same resource constraints
-        dependencies.extend(self._fuzzy_parameter_matching(producers, consumers))
-        
-        self.dependencies = dependencies
-        return dependencies
+        yield from self._fuzzy_parameter_matching(producers, consumers)
     
-    def _should_link_resources(self, param_name: str, prod_resource: str, cons_resource: str) -> bool:
-        """
-        Determine if a parameter dependency should be created between two resources.
-        """
-        # Same resource - always allow
-        if prod_resource == cons_resource:
-            return True
-        
+    def _links_across_resources(self, param_name: str) -> bool:
+        """Whether a parameter may link operations of different resources."""
         # Generic parameters should NOT create cross-resource dependencies
         param_lower = param_name.lower()
         if param_lower in self.GENERIC_PARAMS:
@@ -120,50 +135,71 @@ class ParameterDependencyAnalyzer:
         return False
     
     def _calculate_confidence(self, producer: Operation, consumer: Operation, param: str) -> float:
-        """Calculate confidence score for a dependency"""
+        """Calculate confidence score for a dependency (O(1) lookups in the operation features)"""
         confidence = 1.0
+        producer_features = self._features(producer)
+        consumer_features = self._features(consumer)
         
         # Reduce confidence if producer can produce multiple values for same param
-        producer_responses = [r for r in producer.responses.values() if param in r.produces]
-        if len(producer_responses) > 1:
+        if producer_features.response_counts.get(param, 0) > 1:
             confidence *= 0.8
         
         # Check if parameter is required in consumer
-        consumer_param = next((p for p in consumer.parameters if p.name == param), None)
-        if consumer_param and not consumer_param.required:
+        required = consumer_features.required
+        if param in required and not required[param]:
             confidence *= 0.7
         
         # Check type compatibility
-        # ... (implement type checking logic)
+        if not self._types_compatible(producer_features.produced_types.get(param),
+                                      consumer_features.consumed_types.get(param)):
+            confidence *= 0.9
         
         return confidence
     
+    def _features(self, operation: Operation) -> OperationFeatures:
+        """Confidence lookup tables of an operation, built on first use if the parser did not"""
+        if operation.features is None:
+            operation.features = OperationFeatures.from_operation(operation, self.constraint_cache)
+        return operation.features
+    
+    def _types_compatible(self, produced_type, consumed_type) -> bool:
+        """Declared types are compatible unless both are known and fall in different families"""
+        if not isinstance(produced_type, str) or not isinstance(consumed_type, str):
+            return True
+        produced = self.TYPE_FAMILIES.get(produced_type, produced_type)
+        consumed = self.TYPE_FAMILIES.get(consumed_type, consumed_type)
+        if produced == consumed:
+            return True
+        # Any scalar can be passed to a string parameter (e.g. an integer id in a path segment)
+        return consumed == 'string' and produced in ('number', 'boolean')
+    
     def _fuzzy_parameter_matching(self, 
                                    producers: Dict[Tuple[str, str], List[Operation]], 
-                                   consumers: Dict[Tuple[str, str], List[Operation]]) -> List[Dependency]:
+                                   consumers: Dict[Tuple[str, str], List[Operation]]) -> Iterator[DependencyRecord]:
         """Find dependencies using fuzzy parameter name matching"""
-        dependencies = []
-        
-        # Common parameter name variations
-        variations = {
-            'id': ['ID', 'Id', '_id', 'identifier'],
-            'user_id': ['userId', 'user_ID', 'userID', 'uid'],
-            'username': ['user_name', 'userName', 'login', 'user'],
-            'pet_id': ['petId', 'pet_ID', 'petID'],
-            'order_id': ['orderId', 'order_ID', 'orderID'],
+        matcher = ParameterNameMatcher(self.NAME_VARIATIONS)
+        
+        # Only fuzzy match within same resource type: consumer names per resource,
+        # in consumer order, with an index that yields just the plausible variants
+        consumers_by_resource: Dict[str, List[Tuple[str, List[Operation]]]] = {}
+        for (cons_param, cons_resource), cons_ops in consumers.items():
+            consumers_by_resource.setdefault(cons_resource, []).append((cons_param, cons_ops))
+        indexes = {
+            resource: NameIndex(matcher, [param for param, _ in entries])
+            for resource, entries in consumers_by_resource.items()
         }
         
         for (prod_param, prod_resource), prod_ops in producers.items():
-            for (cons_param, cons_resource), cons_ops in consumers.items():
+            entries = consumers_by_resource.get(prod_resource)
+            if not entries:
+                continue
+            for position in indexes[prod_resource].candidates(prod_param):
+                cons_param, cons_ops = entries[position]
                 if prod_param == cons_param:
                     continue
                     
-                # Only fuzzy match within same resource type
-                if prod_resource != cons_resource:
-                    continue
-                    
                 # Check if they're variations of the same parameter
-                if self._are_parameter_variants(prod_param, cons_param, variations):
+                if matcher.is_variant(prod_param, cons_param):
                     for producer in prod_ops:
                         for consumer in cons_ops:
                             if producer == consumer:
@@ -171,7 +207,7 @@ class ParameterDependencyAnalyzer:
                             # Skip semantically backward dependencies
                             if self._is_semantic_backward(producer, consumer):
                                 continue
-                            dep = Dependency(
+                            yield DependencyRecord(
                                 source=producer,
                                 target=consumer,
                                 type=DependencyType.PARAMETER_DATA,
@@ -179,24 +215,3 @@ class ParameterDependencyAnalyzer:
                                 confidence=0.6,  # Lower confidence for fuzzy matching
                                 reason=f"Fuzzy match: '{prod_param}' -> '{cons_param}'"
                             )
-                            dependencies.append(dep)
-        
-        return dependencies
-    
-    def _are_parameter_variants(self, param1: str, param2: str, 
-                                variations: Dict[str, List[str]]) -> bool:
-        """Check if two parameter names are likely variants"""
-        # Normalize
-        p1 = param1.lower().replace('_', '').replace('-', '')
-        p2 = param2.lower().replace('_', '').replace('-', '')
-        
-        # Check direct variation
-        for base, variants in variations.items():
-            normalized_variants = [v.lower().replace('_', '').replace('-', '') for v in variants]
-            if p1 in normalized_variants and p2 in normalized_variants:
-                return True
-        
-        # Levenshtein distance
-        from difflib import SequenceMatcher
-        similarity = SequenceMatcher(None, p1, p2).ratio()
-        return similarity > 0.8
\ No newline at end of file
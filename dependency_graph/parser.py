@@ -1,45 +1,112 @@
-import yaml
-import json
-from typing import Dict, Any, List, Optional, Set
-from urllib.parse import urlparse
+import sys
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Set, Tuple
 from .operation import Operation
 from .parameter import Parameter
 from .response import Response
 from .enums import HTTPMethod
+from .features import OperationFeatures
+from .constraints import ConstraintCache
+from .refs import DocumentStore, RefResolver
+from .streaming import SpecStream
+
+# (prefix-relative property name, declared type) produced by a schema walk
+SchemaEntry = Tuple[str, Any]
+
+# Cycle depth reported by a walk that cut no $ref cycle
+NO_CYCLE = sys.maxsize
+
+# Path item keys that hold operations (matched case-insensitively)
+HTTP_METHODS = frozenset(method.value for method in HTTPMethod)
+
+# Parameter schema keys kept by the lazy parser once an operation is extracted
+LAZY_SCHEMA_KEYS = ('type', 'format', 'example', '$ref')
 
 class OpenAPIParser:
     """Parse and extract information from OpenAPI specification"""
     
-    def __init__(self, spec_path: str):
+    def __init__(self, spec_path: str, documents: Optional[DocumentStore] = None,
+                 lazy: bool = False):
         self.spec_path = spec_path
+        # Read path items one at a time from the file and keep only what the
+        # analyzers use (see iter_operations); spec then holds no paths
+        self.lazy = lazy
         self.spec: Dict[str, Any] = {}
         self.operations: List[Operation] = []
-        self.schemas: Dict[str, Any] = {}
+        # $ref resolution; documents (this spec and any it references) are loaded
+        # through the store, this parser's own unless one is given to share
+        self.resolver = RefResolver(spec_path, documents)
+        # Compiled patterns, ranges and flattened schemas shared by every operation of the spec
+        self.constraint_cache = ConstraintCache(self.resolver)
+        # canonical schema $ref -> walked (relative property name, declared type) entries
+        self.schema_cache: Dict[str, Tuple[SchemaEntry, ...]] = {}
+        # canonical parameter $ref -> Parameter, shared by every operation using it
+        self.parameter_cache: Dict[str, Parameter] = {}
+        self._schema_stack: List[str] = []
         
     def parse(self) -> List[Operation]:
         """Main parsing method"""
+        self.operations.extend(self.iter_operations())
+        return self.operations
+    
+    def iter_operations(self) -> Iterator[Operation]:
+        """
+        Load the specification and yield its operations in path order.
+        
+        In lazy mode the file is read with an event-based reader: everything but
+        paths is loaded first, then path items are built one at a time and
+        dropped once their operations are extracted. Those operations keep the
+        extracted sets, constraints and features but not the raw request body,
+        response schemas/headers or nested parameter schemas.
+        """
         # Load specification
-        with open(self.spec_path, 'r',encoding='utf-8') as f:
-            if self.spec_path.endswith('.yaml') or self.spec_path.endswith('.yml'):
-                self.spec = yaml.safe_load(f)
-            else:
-                self.spec = json.load(f)
+        if self.lazy:
+            stream = SpecStream(self.spec_path)
+            self.spec = stream.skeleton()
+            self.resolver.root = self.spec
+            self.resolver.root_path_item = stream.path_item
+            path_items = stream.path_items()
+        else:
+            self.spec = self.resolver.documents.load(self.spec_path)
+            path_items = self.spec.get('paths', {}).items()
         
-        # Extract schemas
-        self.schemas = self.spec.get('components', {}).get('schemas', {})
+        # Schemas are flattened through the resolver, fresh for every load
+        self.constraint_cache = ConstraintCache(self.resolver)
         
         # Extract operations
-        paths = self.spec.get('paths', {})
-        for path, path_item in paths.items():
+        for path, path_item in path_items:
+            path_item, base = self.resolver.deref(path_item)
+            # Path-level parameters are parsed once and shared by the item's operations
+            path_parameters = self._parse_parameters(path_item.get('parameters') or [], base)
             for method, operation_spec in path_item.items():
-                if method.upper() in ['GET', 'POST', 'PUT', 'DELETE', 'PATCH']:
-                    operation = self._parse_operation(path, method.upper(), operation_spec)
-                    self.operations.append(operation)
-        
-        return self.operations
+                if method.upper() in HTTP_METHODS:
+                    operation = self._parse_operation(path, method.upper(), operation_spec, base,
+                                                      path_parameters)
+                    if self.lazy:
+                        self._drop_raw_schemas(operation)
+                    yield operation
+            if self.lazy:
+                self.constraint_cache.release_inline()
+    
+    @staticmethod
+    def _drop_raw_schemas(operation: Operation):
+        """Release the spec dicts an extracted operation would otherwise keep alive"""
+        operation.request_body = None
+        for response in operation.responses.values():
+            response.schema = {}
+            response.headers = {}
+        for param in operation.parameters:
+            if isinstance(param.schema, dict):
+                param.schema = {key: param.schema[key] for key in LAZY_SCHEMA_KEYS
+                                if key in param.schema}
     
-    def _parse_operation(self, path: str, method: str, spec: Dict[str, Any]) -> Operation:
-        """Parse a single operation"""
+    def _parse_operation(self, path: str, method: str, spec: Dict[str, Any],
+                         base: Optional[str] = None,
+                         path_parameters: Sequence[Parameter] = ()) -> Operation:
+        """
+        Parse a single operation (base: document it was loaded from, for relative $refs).
+        Path-level parameters apply unless the operation declares one with the
+        same name and location; they follow the operation's own parameters.
+        """
         operation_id = spec.get('operationId', f"{method}_{path.replace('/', '_')}")
         
         # Parse parameters
@@ -47,11 +114,17 @@ class OpenAPIParser:
         consumes = set()
         produces = set()
         path_params = set()
+        features = OperationFeatures()
         
-        for param_spec in spec.get('parameters', []):
-            param = self._parse_parameter(param_spec)
+        own_parameters = self._parse_parameters(spec.get('parameters', []), base)
+        overridden = {(param.name, param.location) for param in own_parameters}
+        inherited = [param for param in path_parameters
+                     if (param.name, param.location) not in overridden]
+        
+        for param in own_parameters + inherited:
             parameters.append(param)
             consumes.add(param.name)
+            features.add_parameter(param, self.constraint_cache)
             
             if param.location == 'path':
                 path_params.add(param.name)
@@ -59,16 +132,25 @@ class OpenAPIParser:
         # Parse request body
         request_body = None
         if 'requestBody' in spec:
-            request_body = spec['requestBody']
-            body_params = self._extract_body_parameters(request_body)
+            request_body, body_base = self.resolver.deref(spec['requestBody'], base)
+            body_types: Dict[str, str] = {}
+            body_params = self._extract_body_parameters(request_body, body_types, body_base)
             consumes.update(body_params)
+            for name, declared in body_types.items():
+                features.consumed_types.setdefault(name, declared)
+            features.add_request_body(request_body, self.constraint_cache, body_base)
         
         # Parse responses
         responses = {}
         for status_code, response_spec in spec.get('responses', {}).items():
-            response = self._parse_response(status_code, response_spec)
+            response_spec, response_base = self.resolver.deref(response_spec, base)
+            response = self._parse_response(status_code, response_spec, features.produced_types,
+                                            response_base)
             responses[status_code] = response
             produces.update(response.produces)
+            features.add_response_schema(response.schema, self.constraint_cache, response_base)
+            for param in response.produces:
+                features.response_counts[param] = features.response_counts.get(param, 0) + 1
         
         # Extract resource type
         resource_type = self._extract_resource_type(path)
@@ -85,33 +167,56 @@ class OpenAPIParser:
             consumes=consumes,
             produces=produces,
             path_params=path_params,
-            resource_type=resource_type
+            resource_type=resource_type,
+            features=features
         )
         
         return operation
     
-    def _parse_parameter(self, spec: Dict[str, Any]) -> Parameter:
-        """Parse a parameter specification"""
+    def _parse_parameters(self, specs: List[Dict[str, Any]],
+                          base: Optional[str] = None) -> List[Parameter]:
+        """Parse a parameters list; referenced parameters are parsed once per canonical $ref"""
+        parameters = []
+        for spec in specs:
+            ref = spec.get('$ref') if isinstance(spec, dict) else None
+            if not isinstance(ref, str):
+                parameters.append(self._parse_parameter(spec, base))
+                continue
+            key = self.resolver.canonical(ref, base)
+            param = self.parameter_cache.get(key)
+            if param is None:
+                param = self.parameter_cache[key] = self._parse_parameter(
+                    *self.resolver.deref(spec, base))
+            parameters.append(param)
+        return parameters
+    
+    def _parse_parameter(self, spec: Dict[str, Any], base: Optional[str] = None) -> Parameter:
+        """Parse a parameter specification (type and constraints come from its resolved schema)"""
+        schema = spec.get('schema', {})
+        resolved, _ = self.resolver.deref(schema, base)
         return Parameter(
             name=spec.get('name', ''),
             location=spec.get('in', ''),
-            type=spec.get('schema', {}).get('type', 'string'),
+            type=resolved.get('type', 'string'),
             required=spec.get('required', False),
-            schema=spec.get('schema', {}),
+            schema=schema,
             example=spec.get('example'),
             description=spec.get('description'),
             constraints={
-                'minimum': spec.get('schema', {}).get('minimum'),
-                'maximum': spec.get('schema', {}).get('maximum'),
-                'pattern': spec.get('schema', {}).get('pattern'),
-                'enum': spec.get('schema', {}).get('enum'),
-                'minLength': spec.get('schema', {}).get('minLength'),
-                'maxLength': spec.get('schema', {}).get('maxLength'),
+                'type': resolved.get('type'),
+                'minimum': resolved.get('minimum'),
+                'maximum': resolved.get('maximum'),
+                'pattern': resolved.get('pattern'),
+                'enum': resolved.get('enum'),
+                'minLength': resolved.get('minLength'),
+                'maxLength': resolved.get('maxLength'),
             }
         )
     
-    def _parse_response(self, status_code: str, spec: Dict[str, Any]) -> Response:
-        """Parse a response specification"""
+    def _parse_response(self, status_code: str, spec: Dict[str, Any],
+                        types: Optional[Dict[str, str]] = None,
+                        base: Optional[str] = None) -> Response:
+        """Parse a response specification (declared property types are collected into types)"""
         produces = set()
         schema = {}
         
@@ -120,7 +225,7 @@ class OpenAPIParser:
             if 'schema' in media_spec:
                 schema = media_spec['schema']
                 # Extract producible parameters from schema
-                produces.update(self._extract_schema_properties(schema))
+                produces.update(self._extract_schema_properties(schema, types=types, base=base))
         
         return Response(
             status_code=status_code,
@@ -129,37 +234,92 @@ class OpenAPIParser:
             produces=produces
         )
     
-    def _extract_schema_properties(self, schema: Dict[str, Any], prefix: str = '') -> Set[str]:
-        """Recursively extract property names from schema"""
+    def _extract_schema_properties(self, schema: Dict[str, Any], prefix: str = '',
+                                   types: Optional[Dict[str, str]] = None,
+                                   base: Optional[str] = None) -> Set[str]:
+        """Extract property names from schema, recording declared types in types"""
         properties = set()
         
+        for name, declared in self._walk_schema(schema, base)[0]:
+            full_name = f"{prefix}.{name}" if prefix else name
+            properties.add(full_name)
+            if types is not None and declared:
+                types.setdefault(full_name, declared)
+        
+        return properties
+    
+    def schema_properties(self, schema: Dict[str, Any], base: Optional[str] = None) -> List[str]:
+        """
+        Prefix-relative property names of a schema in walk order, with $refs
+        resolved through the parser's schema cache (shared with the exporter).
+        """
+        return [name for name, _ in self._walk_schema(schema, base)[0]]
+    
+    def _walk_schema(self, schema: Dict[str, Any],
+                     base: Optional[str] = None) -> Tuple[Sequence[SchemaEntry], int]:
+        """
+        Walk a schema into (relative property name, declared type) entries in the
+        order the recursive extraction visits them. Returns the entries and the
+        depth of the shallowest schema on the $ref stack that a cycle was cut
+        at (NO_CYCLE if none), which decides whether a result may be cached.
+        base is the document holding the schema, against which its $refs resolve.
+        """
         # Handle $ref
-        if '$ref' in schema:
-            ref_path = schema['$ref'].split('/')[-1]
-            if ref_path in self.schemas:
-                return self._extract_schema_properties(self.schemas[ref_path], prefix)
+        if isinstance(schema.get('$ref'), str):
+            target, key = self.resolver.resolve(schema['$ref'], base)
+            if isinstance(target, dict):
+                return self._walk_ref(key, target)
+        
+        entries: List[SchemaEntry] = []
+        cut = NO_CYCLE
         
         # Handle properties
         if 'properties' in schema:
             for prop_name, prop_schema in schema['properties'].items():
-                full_name = f"{prefix}.{prop_name}" if prefix else prop_name
-                properties.add(full_name)
+                entries.append((prop_name, prop_schema.get('type')))
                 
                 # Recurse for nested objects
                 if prop_schema.get('type') == 'object':
-                    properties.update(
-                        self._extract_schema_properties(prop_schema, full_name)
-                    )
+                    nested, nested_cut = self._walk_schema(prop_schema, base)
+                    entries.extend((f"{prop_name}.{name}", declared) for name, declared in nested)
+                    cut = min(cut, nested_cut)
         
         # Handle arrays
         if schema.get('type') == 'array' and 'items' in schema:
-            properties.update(
-                self._extract_schema_properties(schema['items'], prefix)
-            )
+            items, items_cut = self._walk_schema(schema['items'], base)
+            entries.extend(items)
+            cut = min(cut, items_cut)
         
-        return properties
+        return entries, cut
+    
+    def _walk_ref(self, key: str, target: Dict[str, Any]) -> Tuple[Sequence[SchemaEntry], int]:
+        """
+        Cached walk of the schema a canonical $ref (key) resolved to. A $ref back
+        to a schema that is still being walked contributes nothing, so recursive
+        schemas terminate. Results are cached unless they were cut short by a
+        cycle through a schema further up the stack (they may then be incomplete).
+        """
+        cached = self.schema_cache.get(key)
+        if cached is not None:
+            return cached, NO_CYCLE
+        if key in self._schema_stack:
+            return (), self._schema_stack.index(key)
+        
+        depth = len(self._schema_stack)
+        self._schema_stack.append(key)
+        try:
+            entries, cut = self._walk_schema(target, self.resolver.document_of(key))
+        finally:
+            self._schema_stack.pop()
+        
+        if cut >= depth:
+            entries = self.schema_cache[key] = tuple(entries)
+            cut = NO_CYCLE
+        return entries, cut
     
-    def _extract_body_parameters(self, request_body: Dict[str, Any]) -> Set[str]:
+    def _extract_body_parameters(self, request_body: Dict[str, Any],
+                                 types: Optional[Dict[str, str]] = None,
+                                 base: Optional[str] = None) -> Set[str]:
         """Extract parameter names from request body"""
         parameters = set()
         
@@ -167,7 +327,7 @@ class OpenAPIParser:
         for media_type, media_spec in content.items():
             if 'schema' in media_spec:
                 parameters.update(
-                    self._extract_schema_properties(media_spec['schema'])
+                    self._extract_schema_properties(media_spec['schema'], types=types, base=base)
                 )
         
         return parameters
@@ -0,0 +1,48 @@
+from typing import Dict, Hashable, List
+import networkx as nx
+
+class ReachabilityIndex:
+    """
+    Frozen, query-optimized reachability index over a DAG.
+
+    Every node stores its ancestors as a Python int bitset indexed by global
+    topological position, so has_path is a single bit test and an ancestor
+    sequence is read off the bitset in topological order without building a
+    subgraph view (DependencyGraph caches the resulting sequences). The index
+    records the graph version it was built for; DependencyGraph discards it
+    once that version changes.
+    """
+
+    def __init__(self, graph: nx.DiGraph, version: int = 0):
+        self.version = version
+        self.order: List[Hashable] = list(nx.topological_sort(graph))
+        self.position: Dict[Hashable, int] = {node: i for i, node in enumerate(self.order)}
+        self.ancestors: List[int] = [0] * len(self.order)
+
+        position = self.position
+        ancestors = self.ancestors
+        for i, node in enumerate(self.order):
+            bits = 0
+            for pred in graph.pred[node]:
+                p = position[pred]
+                bits |= ancestors[p] | (1 << p)
+            ancestors[i] = bits
+
+    def has_path(self, source: Hashable, target: Hashable) -> bool:
+        """Same answer as nx.has_path(graph, source, target)."""
+        if source not in self.position or target not in self.position:
+            raise nx.NodeNotFound(f"Either source {source} or target {target} is not in G")
+        if source == target:
+            return True
+        return bool((self.ancestors[self.position[target]] >> self.position[source]) & 1)
+
+    def ancestor_sequence(self, node: Hashable) -> List[Hashable]:
+        """All ancestors of node followed by node itself, in topological order."""
+        bits = self.ancestors[self.position[node]]
+        sequence = []
+        while bits:
+            low = bits & -bits
+            sequence.append(self.order[low.bit_length() - 1])
+            bits ^= low
+        sequence.append(node)
+        return sequence
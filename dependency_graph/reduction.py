@@ -0,0 +1,30 @@
+from typing import Hashable, List, Tuple
+import networkx as nx
+
+def redundant_edges(graph: nx.DiGraph) -> List[Tuple[Hashable, Hashable]]:
+    """
+    Return the edges of a DAG that are implied by longer paths.
+    Removing them yields the same edge set as nx.transitive_reduction.
+
+    Nodes are visited in reverse topological order and each node's descendants
+    are packed into a Python int bitset indexed by topological position. A node's
+    successors are scanned in ascending position, so any successor that reaches
+    another one is seen first; an edge is redundant if its target is already
+    covered by an earlier successor's descendants.
+    """
+    order = list(nx.topological_sort(graph))
+    position = {node: i for i, node in enumerate(order)}
+    reach: List[int] = [0] * len(order)
+    redundant: List[Tuple[Hashable, Hashable]] = []
+
+    for i in range(len(order) - 1, -1, -1):
+        node = order[i]
+        covered = 0
+        for child in sorted(position[succ] for succ in graph.succ[node]):
+            if (covered >> child) & 1:
+                redundant.append((node, order[child]))
+            else:
+                covered |= reach[child] | (1 << child)
+        reach[i] = covered
+
+    return redundant
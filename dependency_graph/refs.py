@@ -0,0 +1,210 @@
+import hashlib
+import json
+import os
+import pickle
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import unquote, urlparse
+import yaml
+
+# libyaml's safe loader when PyYAML was built with it; it builds the same documents
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Bumped whenever cached documents may no longer match what parse_document builds
+CACHE_VERSION = b'1'
+
+def is_yaml(path: str) -> bool:
+    return path.endswith('.yaml') or path.endswith('.yml')
+
+def parse_document(content: bytes, path: str) -> Any:
+    """Parse the raw content of a YAML (.yaml/.yml) or JSON spec document"""
+    if is_yaml(path):
+        return yaml.load(content, Loader=YAML_LOADER)
+    return json.loads(content)
+
+def load_document(path: str) -> Any:
+    """Load one YAML (.yaml/.yml) or JSON spec document"""
+    with open(path, 'rb') as f:
+        return parse_document(f.read(), path)
+
+def _is_remote(location: str) -> bool:
+    # One-letter schemes are Windows drive letters
+    return len(urlparse(location).scheme) > 1
+
+
+class DocumentStore:
+    """
+    Loaded spec documents keyed by absolute path.
+
+    Each file is read once and reused for as long as its modification time and
+    size stay the same, so parsers that share a store (e.g. a directory of specs
+    referencing one component library) parse the shared files only once.
+    Documents are shared: callers must not modify them. A store lives as long as
+    the parsers using it; clear() drops every document it holds.
+
+    With a cache_dir, parsed documents are also pickled there under a hash of
+    the file content, so a later process skips YAML/JSON parsing for any file
+    it has seen before, whatever its path or mtime. Only point cache_dir at a
+    directory you trust: entries are unpickled.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir
+        # absolute path -> ((mtime_ns, size), document)
+        self._documents: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+    def load(self, path: str) -> Any:
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._documents.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        if self.cache_dir:
+            document = self._load_cached(path)
+        else:
+            document = load_document(path)
+        self._documents[path] = (version, document)
+        return document
+
+    def _load_cached(self, path: str) -> Any:
+        with open(path, 'rb') as f:
+            content = f.read()
+        digest = hashlib.sha256(CACHE_VERSION)
+        digest.update(b'yaml' if is_yaml(path) else b'json')
+        digest.update(content)
+        entry = os.path.join(self.cache_dir, f"{digest.hexdigest()}.pickle")
+        try:
+            with open(entry, 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            # Missing, partial or unreadable entry: parse and (re)write it
+            pass
+        document = parse_document(content, path)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            partial = f"{entry}.{os.getpid()}.tmp"
+            with open(partial, 'wb') as f:
+                pickle.dump(document, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(partial, entry)
+        except OSError:
+            pass
+        return document
+
+    def __contains__(self, path: str) -> bool:
+        return os.path.abspath(path) in self._documents
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def clear(self):
+        self._documents.clear()
+
+
+class RefResolver:
+    """
+    Resolve $ref values (JSON pointers, optionally into other files) against a spec.
+
+    A reference is canonicalized to "<absolute document path>#<pointer>", with
+    relative file parts taken from the directory of the document that holds the
+    reference. Documents come from a DocumentStore (a new one unless given) and
+    every canonical reference is resolved once. References that cannot be resolved (missing file, remote
+    URL, bad pointer) resolve to None and are collected in unresolved.
+    """
+
+    def __init__(self, base_path: str, documents: Optional[DocumentStore] = None):
+        self.base_path = os.path.abspath(base_path)
+        self.documents = documents if documents is not None else DocumentStore()
+        # Document to use for base_path instead of loading it through the store
+        # (set by the lazy parser, which never holds the whole spec)
+        self.root: Any = None
+        # Reads one path item of the root document when root holds no paths
+        # (the lazy parser's skeleton); pointers under /paths go through it
+        self.root_path_item: Optional[Callable[[str], Any]] = None
+        # canonical reference -> resolved node (None if unresolvable)
+        self._resolved: Dict[str, Any] = {}
+        self.unresolved: Set[str] = set()
+
+    def canonical(self, ref: str, base: Optional[str] = None) -> str:
+        """Canonical form of ref as written in the document at base (the root spec by default)"""
+        base = base or self.base_path
+        location, _, pointer = ref.partition('#')
+        if not location:
+            return f"{base}#{pointer}"
+        if _is_remote(location):
+            # Remote documents are not fetched; keep the URL as the document key
+            return f"{location}#{pointer}"
+        path = os.path.normpath(os.path.join(os.path.dirname(base), unquote(location)))
+        return f"{path}#{pointer}"
+
+    def resolve(self, ref: str, base: Optional[str] = None) -> Tuple[Any, str]:
+        """(target node or None, canonical reference); the target's own refs are relative to its document"""
+        key = self.canonical(ref, base)
+        if key not in self._resolved:
+            self._resolved[key] = self._lookup(key)
+            if self._resolved[key] is None:
+                self.unresolved.add(key)
+        return self._resolved[key], key
+
+    def deref(self, node: Any, base: Optional[str] = None) -> Tuple[Any, str]:
+        """
+        Follow a chain of $ref objects to the node they point at.
+        Returns (node, path of the document it lives in); a node that is not a
+        reference is returned as is, and an unresolvable or cyclic chain stops
+        at the last reference object.
+        """
+        base = base or self.base_path
+        seen: Set[str] = set()
+        while isinstance(node, dict) and isinstance(node.get('$ref'), str):
+            target, key = self.resolve(node['$ref'], base)
+            if target is None or key in seen:
+                break
+            seen.add(key)
+            node, base = target, self.document_of(key)
+        return node, base
+
+    @staticmethod
+    def document_of(key: str) -> str:
+        return key.partition('#')[0]
+
+    def _lookup(self, key: str) -> Any:
+        path, _, pointer = key.partition('#')
+        if _is_remote(path):
+            return None
+        tokens = self._pointer_tokens(pointer)
+        if tokens is None:
+            return None
+        try:
+            if self.root is not None and path == self.base_path:
+                node = self.root
+                if self.root_path_item is not None and len(tokens) > 1 and tokens[0] == 'paths':
+                    node, tokens = self.root_path_item(tokens[1]), tokens[2:]
+            else:
+                node = self.documents.load(path)
+        except (OSError, ValueError, yaml.YAMLError):
+            return None
+        for token in tokens:
+            if isinstance(node, dict):
+                if token not in node:
+                    return None
+                node = node[token]
+            elif isinstance(node, list):
+                if not token.isdigit() or int(token) >= len(node):
+                    return None
+                node = node[int(token)]
+            else:
+                return None
+        return node
+
+    @staticmethod
+    def _pointer_tokens(pointer: str) -> Optional[List[str]]:
+        """
+        Reference tokens of a (URI fragment) JSON pointer; '' addresses the whole
+        document. None for a fragment that is not a pointer (e.g. a plain-name anchor).
+        """
+        pointer = unquote(pointer)
+        if not pointer:
+            return []
+        if not pointer.startswith('/'):
+            return None
+        return [token.replace('~1', '/').replace('~0', '~')
+                for token in pointer[1:].split('/')]
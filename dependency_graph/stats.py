@@ -22,7 +22,8 @@ class GraphStatistics:
 
     def generate_report(self, graph, output_dir: Optional[str] = None) -> Dict[str, Any]:
         report: Dict[str, Any] = {}
-        nxg = getattr(graph, "graph", graph)  # accept DependencyGraph or raw nx graph
+        # accept DependencyGraph (compacted or not) or raw nx graph
+        nxg = graph.networkx_view() if hasattr(graph, "networkx_view") else graph
 
         start_total = time.time()
         num_nodes = nxg.number_of_nodes()
@@ -269,6 +270,15 @@ class GraphStatistics:
             'human_readable': self._human_readable(total_estimated_bytes)
         }
 
+        # Actual footprint of the compact backend, when the graph has been compacted
+        if getattr(graph, "is_compact", False):
+            compact_bytes = graph.compact().nbytes()
+            report['compact_storage'] = {
+                'total_bytes': compact_bytes,
+                'bytes_per_node': int(compact_bytes / num_nodes) if num_nodes else 0,
+                'human_readable': self._human_readable(compact_bytes)
+            }
+
         # Also attempt serialization sizes (pickle) as a secondary indicator
         t0 = time.time()
         try:
@@ -326,6 +336,10 @@ class GraphStatistics:
             print(f"  Estimated total in-memory bytes: {ds.get('total_estimated_bytes')} ({ds.get('human_readable')})")
         else:
             print("  (no detailed size data)")
+        cs = report.get('compact_storage')
+        if cs:
+            print(f"Compact storage: {cs.get('total_bytes')} bytes ({cs.get('human_readable')}), "
+                  f"{cs.get('bytes_per_node')} bytes/node")
         if ser.get('pickle_bytes') is not None:
             print(f"Pickle serialized size: {ser.get('pickle_bytes')} bytes")
         timings = report.get('_timings', {})
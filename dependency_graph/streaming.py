@@ -0,0 +1,225 @@
+import json
+import re
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Tuple
+from yaml.events import (AliasEvent, MappingEndEvent, MappingStartEvent, ScalarEvent,
+                         SequenceEndEvent, SequenceStartEvent)
+from yaml.nodes import MappingNode, Node, ScalarNode, SequenceNode
+from .refs import YAML_LOADER, is_yaml
+
+class EventReader:
+    """
+    Read a YAML document member by member from a libyaml (or pure Python)
+    event stream, so a caller can construct, use and drop parts of a document
+    without holding the whole of it.
+
+    members() yields the keys of the next mapping; after each key the caller
+    must consume its value with value() or skip().
+    """
+
+    def __init__(self, stream):
+        self.loader = YAML_LOADER(stream)
+        # Anchored nodes stay available to aliases anywhere later in the document
+        self.anchors: Dict[str, Node] = {}
+        self.loader.get_event()  # StreamStart
+        self.loader.get_event()  # DocumentStart
+
+    def close(self):
+        self.loader.dispose()
+
+    def is_mapping(self) -> bool:
+        return self.loader.check_event(MappingStartEvent)
+
+    def members(self) -> Iterator[Any]:
+        event = self.loader.get_event()
+        if not isinstance(event, MappingStartEvent):
+            raise ValueError(f"Expected a mapping at {event.start_mark}")
+        while not self.loader.check_event(MappingEndEvent):
+            yield self.value()
+        self.loader.get_event()
+
+    def value(self) -> Any:
+        """Construct the next value."""
+        return self.loader.construct_document(self.compose())
+
+    def skip(self):
+        """
+        Consume the next value without building it. Anchored parts are still
+        composed, since aliases later in the document may refer to them.
+        """
+        loader = self.loader
+        depth = 0
+        while True:
+            event = loader.peek_event()
+            if getattr(event, 'anchor', None) is not None and not isinstance(event, AliasEvent):
+                self.compose()
+            else:
+                loader.get_event()
+                if isinstance(event, (MappingStartEvent, SequenceStartEvent)):
+                    depth += 1
+                elif isinstance(event, (MappingEndEvent, SequenceEndEvent)):
+                    depth -= 1
+            if depth == 0:
+                return
+
+    def compose(self) -> Node:
+        loader = self.loader
+        event = loader.get_event()
+        if isinstance(event, AliasEvent):
+            return self.anchors[event.anchor]
+        tag = event.tag
+        if isinstance(event, ScalarEvent):
+            if tag is None or tag == '!':
+                tag = loader.resolve(ScalarNode, event.value, event.implicit)
+            node = ScalarNode(tag, event.value, event.start_mark, event.end_mark, style=event.style)
+            if event.anchor is not None:
+                self.anchors[event.anchor] = node
+            return node
+        if isinstance(event, SequenceStartEvent):
+            if tag is None or tag == '!':
+                tag = loader.resolve(SequenceNode, None, event.implicit)
+            node = SequenceNode(tag, [], event.start_mark, None, flow_style=event.flow_style)
+            if event.anchor is not None:
+                self.anchors[event.anchor] = node
+            while not loader.check_event(SequenceEndEvent):
+                node.value.append(self.compose())
+        else:
+            if tag is None or tag == '!':
+                tag = loader.resolve(MappingNode, None, event.implicit)
+            node = MappingNode(tag, [], event.start_mark, None, flow_style=event.flow_style)
+            if event.anchor is not None:
+                self.anchors[event.anchor] = node
+            while not loader.check_event(MappingEndEvent):
+                key = self.compose()
+                node.value.append((key, self.compose()))
+        node.end_mark = loader.get_event().end_mark
+        return node
+
+
+class JsonReader:
+    """
+    The EventReader interface over JSON text: values are decoded one at a time
+    with the C decoder and skipped values are scanned without being built.
+    """
+
+    WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def close(self):
+        self.text = ''
+
+    def _peek(self) -> str:
+        self.pos = self.WHITESPACE.match(self.text, self.pos).end()
+        return self.text[self.pos:self.pos + 1]
+
+    def _expect(self, *chars: str) -> str:
+        char = self._peek()
+        if char not in chars:
+            raise ValueError(f"Expected {' or '.join(chars)} at offset {self.pos}")
+        self.pos += 1
+        return char
+
+    def is_mapping(self) -> bool:
+        return self._peek() == '{'
+
+    def members(self) -> Iterator[Any]:
+        self._expect('{')
+        if self._peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self._expect(':')
+            yield key
+            if self._expect(',', '}') == '}':
+                return
+
+    def value(self) -> Any:
+        self._peek()
+        value, self.pos = self.decoder.raw_decode(self.text, self.pos)
+        return value
+
+    def skip(self):
+        char = self._peek()
+        if char == '{':
+            for _ in self.members():
+                self.skip()
+        elif char == '[':
+            self.pos += 1
+            if self._peek() == ']':
+                self.pos += 1
+                return
+            while True:
+                self.skip()
+                if self._expect(',', ']') == ']':
+                    return
+        else:
+            self.value()
+
+
+class SpecStream:
+    """
+    Two-pass reader of a large spec file.
+
+    skeleton() reads every top-level entry except 'paths' (which becomes an
+    empty mapping). path_items() reads the file again and yields (path, path
+    item) pairs one at a time, so only the current path item is ever built
+    in full. path_item() reads the file for a single path item.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def skeleton(self) -> Dict[str, Any]:
+        document: Dict[str, Any] = {}
+        with self._reader() as reader:
+            for key in reader.members():
+                if key == 'paths':
+                    reader.skip()
+                    document[key] = {}
+                else:
+                    document[key] = reader.value()
+        return document
+
+    def path_items(self) -> Iterator[Tuple[str, Any]]:
+        with self._reader() as reader:
+            for key in reader.members():
+                if key != 'paths' or not reader.is_mapping():
+                    reader.skip()
+                    continue
+                for path in reader.members():
+                    yield path, reader.value()
+
+    def path_item(self, path: str) -> Any:
+        """The path item of path, or None if the spec has none"""
+        with self._reader() as reader:
+            for key in reader.members():
+                if key != 'paths' or not reader.is_mapping():
+                    reader.skip()
+                    continue
+                for name in reader.members():
+                    if name == path:
+                        return reader.value()
+                    reader.skip()
+        return None
+
+    @contextmanager
+    def _reader(self):
+        if is_yaml(self.path):
+            with open(self.path, 'rb') as f:
+                reader = EventReader(f)
+                try:
+                    yield reader
+                finally:
+                    reader.close()
+        else:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                reader = JsonReader(f.read())
+            try:
+                yield reader
+            finally:
+                reader.close()
@@ -0,0 +1,92 @@
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Hashable
+
+Adjacency = Mapping[Hashable, Iterable[Hashable]]
+
+class IncrementalTopologicalOrder:
+    """
+    Dynamic topological order (Pearce-Kelly) used for incremental cycle checks.
+
+    Every node gets an integer position such that all edges point from a lower
+    to a higher position. Inserting u->v with ord[u] < ord[v] is free; otherwise
+    only the nodes whose positions lie between ord[v] and ord[u] are visited and
+    reordered. Adjacency is passed in on every insertion (e.g. graph.succ and
+    graph.pred of the live networkx graph), so edge removals such as dynamic
+    feedback or transitive reduction never invalidate the order.
+    """
+
+    def __init__(self):
+        self.ord: Dict[Hashable, int] = {}
+        self._next_index = 0
+
+    def add_node(self, node: Hashable):
+        """Append a node at the end of the current order."""
+        if node not in self.ord:
+            self.ord[node] = self._next_index
+            self._next_index += 1
+
+    def insert_edge(self, successors: Adjacency, predecessors: Adjacency,
+                    source: Hashable, target: Hashable) -> bool:
+        """
+        Update the order for a new edge source->target.
+        Returns False (leaving the order untouched) if the edge would close a cycle,
+        i.e. exactly when nx.has_path(graph, target, source) is True.
+        The caller adds the edge to the adjacency afterwards.
+        """
+        self.add_node(source)
+        self.add_node(target)
+
+        if source == target:
+            return False
+
+        upper = self.ord[source]
+        lower = self.ord[target]
+        if lower > upper:
+            # Already consistent with the order - no path target->source can exist
+            return True
+
+        forward = self._forward_region(successors, target, upper)
+        if forward is None:
+            return False
+        backward = self._backward_region(predecessors, source, lower)
+        self._reorder(backward, forward)
+        return True
+
+    def _forward_region(self, successors: Adjacency, start: Hashable,
+                        upper: int) -> Optional[Set[Hashable]]:
+        """Nodes reachable from start with position below upper, or None on a cycle."""
+        ord_ = self.ord
+        visited: Set[Hashable] = {start}
+        stack: List[Hashable] = [start]
+        while stack:
+            node = stack.pop()
+            for succ in successors[node]:
+                pos = ord_[succ]
+                if pos == upper:
+                    return None
+                if pos < upper and succ not in visited:
+                    visited.add(succ)
+                    stack.append(succ)
+        return visited
+
+    def _backward_region(self, predecessors: Adjacency, start: Hashable,
+                         lower: int) -> Set[Hashable]:
+        """Nodes that reach start with position above lower."""
+        ord_ = self.ord
+        visited: Set[Hashable] = {start}
+        stack: List[Hashable] = [start]
+        while stack:
+            node = stack.pop()
+            for pred in predecessors[node]:
+                if ord_[pred] > lower and pred not in visited:
+                    visited.add(pred)
+                    stack.append(pred)
+        return visited
+
+    def _reorder(self, backward: Set[Hashable], forward: Set[Hashable]):
+        """Move the backward region in front of the forward region, reusing their positions."""
+        ord_ = self.ord
+        backward_nodes = sorted(backward, key=ord_.__getitem__)
+        forward_nodes = sorted(forward, key=ord_.__getitem__)
+        positions = sorted(ord_[n] for n in backward_nodes + forward_nodes)
+        for node, pos in zip(backward_nodes + forward_nodes, positions):
+            ord_[node] = pos
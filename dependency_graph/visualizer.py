@@ -49,7 +49,7 @@ class GraphVisualizer:
         """Export to GraphML format"""
         # GraphML format does not support complex Python objects as attributes.
         # We create a sanitized copy of the graph with these objects removed for export.
-        graph_to_export = self.graph.graph.copy()
+        graph_to_export = self.graph.networkx_view().copy()
         
         # Remove the 'operation' object from nodes, as it's not serializable
         for _, data in graph_to_export.nodes(data=True):
@@ -61,6 +61,12 @@ class GraphVisualizer:
             if 'dependency' in data:
                 del data['dependency']
 
+        # GraphML has no null: unset attributes (e.g. resource_type of '/') are left out
+        for data in [d for _, d in graph_to_export.nodes(data=True)] + \
+                    [d for _, _, d in graph_to_export.edges(data=True)]:
+            for key in [key for key, value in data.items() if value is None]:
+                del data[key]
+        
         try:
             import networkx as nx
             nx.write_graphml(graph_to_export, output_path)
@@ -268,7 +274,7 @@ class GraphVisualizer:
                 "produces": list(op_data.produces)
             })
 
-        for u, v, data in self.graph.graph.edges(data=True):
+        for u, v, data in self.graph.networkx_view().edges(data=True):
             edges.append({
                 "from": u,
                 "to": v,
@@ -0,0 +1,25 @@
+import random
+
+import networkx as nx
+import pytest
+
+
+def random_dag(rng: random.Random, nodes: int, density: float) -> nx.DiGraph:
+    """A DAG over shuffled node names: edges only point forward in a hidden order"""
+    names = [f"op{i}" for i in range(nodes)]
+    rng.shuffle(names)
+    graph = nx.DiGraph()
+    graph.add_nodes_from(names)
+    for i in range(nodes):
+        for j in range(i + 1, nodes):
+            if rng.random() < density:
+                graph.add_edge(names[i], names[j])
+    return graph
+
+
+@pytest.fixture
+def random_dags():
+    """200 random DAGs of varied size and density (fixed seed)"""
+    rng = random.Random(2024)
+    return [random_dag(rng, rng.randint(1, 40), rng.choice((0.05, 0.15, 0.4)))
+            for _ in range(200)]
@@ -0,0 +1,45 @@
+from dependency_graph.constraint_analyzer import ConstraintDependencyAnalyzer
+from dependency_graph.enums import HTTPMethod
+from dependency_graph.operation import Operation
+from dependency_graph.parameter import Parameter
+
+
+def make_operation(operation_id, method, **constraints):
+    param = Parameter(name='name', location='query', type=constraints.get('type', 'string'),
+                      required=True, constraints=constraints)
+    return Operation(operation_id=operation_id, path=f'/items/{operation_id}', method=method,
+                     parameters=[param], resource_type='items')
+
+
+def edges(operations, kind):
+    analyzer = ConstraintDependencyAnalyzer(operations)
+    return {(record.source.operation_id, record.target.operation_id)
+            for record in analyzer.iter_dependencies() if record.constraint.startswith(kind)}
+
+
+def test_pattern_links_same_pattern_and_unconstrained_targets():
+    operations = [
+        make_operation('create', HTTPMethod.POST, pattern='^[a-z]+$'),
+        make_operation('update', HTTPMethod.PUT, pattern='^[a-z]+$'),
+        make_operation('search', HTTPMethod.GET),
+    ]
+    assert edges(operations, 'pattern:') == {
+        ('create', 'update'), ('create', 'search'), ('update', 'create'), ('update', 'search')}
+
+
+def test_uncompilable_pattern_is_neither_source_nor_target():
+    # \pL is a valid PCRE class but not a Python re one
+    operations = [
+        make_operation('create', HTTPMethod.POST, pattern='^[a-z]+$'),
+        make_operation('register', HTTPMethod.POST, pattern="^[\\pL '-]+$"),
+    ]
+    assert edges(operations, 'pattern:') == set()
+
+
+def test_range_only_for_numeric_parameters():
+    operations = [
+        make_operation('create', HTTPMethod.POST, type='string', minimum=0, maximum=50),
+        make_operation('update', HTTPMethod.PUT, type='integer', minimum=0, maximum=50),
+        make_operation('search', HTTPMethod.GET, type='integer', minimum=10, maximum=20),
+    ]
+    assert edges(operations, 'range:') == {('update', 'create'), ('update', 'search')}
@@ -0,0 +1,54 @@
+import random
+from difflib import SequenceMatcher
+
+from dependency_graph.fuzzy_matching import NameIndex, ParameterNameMatcher
+from dependency_graph.parameter_analyzer import ParameterDependencyAnalyzer
+
+VARIATIONS = ParameterDependencyAnalyzer.NAME_VARIATIONS
+
+
+def reference_is_variant(param1, param2):
+    """The per-pair check ParameterNameMatcher replaced"""
+    p1 = param1.lower().replace('_', '').replace('-', '')
+    p2 = param2.lower().replace('_', '').replace('-', '')
+    for variants in VARIATIONS.values():
+        normalized_variants = [v.lower().replace('_', '').replace('-', '') for v in variants]
+        if p1 in normalized_variants and p2 in normalized_variants:
+            return True
+    return SequenceMatcher(None, p1, p2).ratio() > 0.8
+
+
+def random_names(rng, count):
+    stems = ['user', 'pet', 'order', 'id', 'name', 'owner', 'repo', 'status', 'item', 'tag']
+    known = [variant for variants in VARIATIONS.values() for variant in variants]
+    names = list(known)
+    while len(names) < count:
+        if rng.random() < 0.5:
+            name = rng.choice(['_', '-', '']).join(rng.sample(stems, rng.randint(1, 3)))
+        else:
+            name = ''.join(rng.choice('abcdeiou_-IDN') for _ in range(rng.randint(0, 12)))
+        if rng.random() < 0.3:
+            name = name.upper() if rng.random() < 0.5 else name.capitalize()
+        names.append(name)
+    return names
+
+
+def test_matcher_matches_reference():
+    rng = random.Random(3)
+    names = random_names(rng, 300)
+    matcher = ParameterNameMatcher(VARIATIONS)
+    for _ in range(30000):
+        name1, name2 = rng.choice(names), rng.choice(names)
+        assert matcher.is_variant(name1, name2) == reference_is_variant(name1, name2), (name1, name2)
+
+
+def test_name_index_candidates_cover_every_variant():
+    rng = random.Random(5)
+    names = random_names(rng, 200)
+    matcher = ParameterNameMatcher(VARIATIONS)
+    index = NameIndex(matcher, names)
+    for name in names:
+        candidates = index.candidates(name)
+        assert candidates == sorted(set(candidates))
+        variants = [i for i, other in enumerate(names) if reference_is_variant(name, other)]
+        assert set(variants) <= set(candidates)
@@ -0,0 +1,23 @@
+import networkx as nx
+
+from dependency_graph.reachability import ReachabilityIndex
+
+
+def test_has_path_matches_networkx(random_dags):
+    for graph in random_dags:
+        index = ReachabilityIndex(graph)
+        for source in graph.nodes:
+            for target in graph.nodes:
+                assert index.has_path(source, target) == nx.has_path(graph, source, target)
+
+
+def test_ancestor_sequence_is_topologically_ordered(random_dags):
+    for graph in random_dags:
+        index = ReachabilityIndex(graph)
+        for node in graph.nodes:
+            sequence = index.ancestor_sequence(node)
+            assert sequence[-1] == node
+            assert set(sequence) == nx.ancestors(graph, node) | {node}
+            position = {op: i for i, op in enumerate(sequence)}
+            for source, target in graph.subgraph(sequence).edges:
+                assert position[source] < position[target]
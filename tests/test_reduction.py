@@ -0,0 +1,34 @@
+import networkx as nx
+
+from dependency_graph.core import DependencyGraph
+from dependency_graph.dependency import Dependency
+from dependency_graph.enums import DependencyType, HTTPMethod
+from dependency_graph.operation import Operation
+from dependency_graph.reduction import redundant_edges
+
+
+def test_redundant_edges_match_networkx(random_dags):
+    for graph in random_dags:
+        reduced = graph.copy()
+        reduced.remove_edges_from(redundant_edges(graph))
+        assert set(reduced.edges) == set(nx.transitive_reduction(graph).edges)
+
+
+def test_transitive_reduction_in_place_keeps_attributes_and_dependencies(random_dags):
+    for dag in random_dags[:50]:
+        graph = DependencyGraph()
+        operations = {node: Operation(operation_id=node, path=f"/{node}", method=HTTPMethod.GET)
+                      for node in dag.nodes}
+        for operation in operations.values():
+            graph.add_operation(operation)
+        for source, target in dag.edges:
+            assert graph.add_dependency_if_acyclic(Dependency(
+                source=operations[source], target=operations[target],
+                type=DependencyType.CRUD, reason=f"{source}->{target}"))
+        removed = graph.transitive_reduction()
+        expected = set(nx.transitive_reduction(dag).edges)
+        assert removed == dag.number_of_edges() - len(expected)
+        assert set(graph.graph.edges) == expected
+        assert {(d.source.operation_id, d.target.operation_id) for d in graph.dependencies} == expected
+        for source, target, attrs in graph.graph.edges(data=True):
+            assert attrs['reason'] == f"{source}->{target}"
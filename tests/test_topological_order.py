@@ -0,0 +1,67 @@
+import random
+
+import networkx as nx
+
+from dependency_graph.core import DependencyGraph
+from dependency_graph.dependency import Dependency
+from dependency_graph.enums import DependencyType, HTTPMethod
+from dependency_graph.operation import Operation
+from dependency_graph.topological_order import IncrementalTopologicalOrder
+
+
+def random_edge_stream(rng, nodes, count):
+    """Random (source, target) pairs, cycle-closing ones included"""
+    return [(f"op{rng.randrange(nodes)}", f"op{rng.randrange(nodes)}") for _ in range(count)]
+
+
+def assert_valid_order(order, graph):
+    for source, target in graph.edges:
+        assert order.ord[source] < order.ord[target]
+
+
+def test_insert_edge_matches_has_path_and_keeps_order_valid():
+    rng = random.Random(7)
+    for _ in range(200):
+        nodes = rng.randint(2, 30)
+        graph = nx.DiGraph()
+        order = IncrementalTopologicalOrder()
+        for i in range(nodes):
+            graph.add_node(f"op{i}")
+            order.add_node(f"op{i}")
+        for source, target in random_edge_stream(rng, nodes, nodes * 3):
+            expected = source != target and not nx.has_path(graph, target, source)
+            assert order.insert_edge(graph.succ, graph.pred, source, target) == expected
+            if expected:
+                graph.add_edge(source, target)
+            assert_valid_order(order, graph)
+        assert nx.is_directed_acyclic_graph(graph)
+
+
+def make_graph(nodes, incremental):
+    graph = DependencyGraph(incremental_cycle_check=incremental)
+    operations = [Operation(operation_id=f"op{i}", path=f"/op{i}", method=HTTPMethod.GET)
+                  for i in range(nodes)]
+    for operation in operations:
+        graph.add_operation(operation)
+    return graph, operations
+
+
+def test_dependency_graph_insertion_paths_agree():
+    rng = random.Random(11)
+    for _ in range(100):
+        nodes = rng.randint(2, 25)
+        plain, operations = make_graph(nodes, incremental=False)
+        incremental, _ = make_graph(nodes, incremental=True)
+        bulk, _ = make_graph(nodes, incremental=True)
+        dependencies = [
+            Dependency(source=operations[rng.randrange(nodes)],
+                       target=operations[rng.randrange(nodes)],
+                       type=DependencyType.PARAMETER_DATA)
+            for _ in range(nodes * 3)
+        ]
+        expected = [plain.add_dependency_if_acyclic(dep) for dep in dependencies]
+        assert [incremental.add_dependency_if_acyclic(dep) for dep in dependencies] == expected
+        accepted, rejected, _ = bulk.add_dependencies_bulk(dependencies)
+        assert [dep for dep, ok in zip(dependencies, expected) if ok] == accepted
+        assert len(accepted) + len(rejected) == len(dependencies)
+        assert set(bulk.graph.edges) == set(plain.graph.edges)